@@ -9,16 +9,42 @@ The CLI functions are small and intentionally call into the package
 API so tests can exercise logic without spawning subprocesses.
 """
 import argparse
+import functools
+import json
+import os
+import sys
 from pathlib import Path
-from importlib.metadata import version
 from datetime import datetime
-from . import set_dates as set_dates_mod
-from . import transcode as transcode_mod
-from . import organize as organize_mod
-from . import search as search_mod
-import glob
+from . import utils
 
-__version__ = version("datefixer")
+# The subcommand modules are imported inside their handlers so that
+# `--help`, `--version` and each subcommand only pay for what they use.
+
+_VIDEO_EXTS = frozenset({"mp4", "avi", "mkv", "mov", "flv", "wmv"})
+
+
+@functools.cache
+def _get_version() -> str:
+    """Return the installed package version, read from metadata once."""
+    from importlib.metadata import version
+
+    return version("datefixer")
+
+
+def __getattr__(name):
+    if name == "__version__":
+        return _get_version()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _VersionAction(argparse.Action):
+    """``--version`` action that looks up the installed version only when used."""
+
+    def __init__(self, option_strings, dest=argparse.SUPPRESS, default=argparse.SUPPRESS, help="show program's version number and exit"):
+        super().__init__(option_strings=option_strings, dest=dest, default=default, nargs=0, help=help)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        parser.exit(message=f"{_get_version()}\n")
 
 
 def cmd_set_dates(args):
@@ -27,14 +53,11 @@ def cmd_set_dates(args):
     This wrapper extracts individual arguments from the argparse Namespace
     and passes them explicitly to the implementation.
     """
-    _arg_dt = getattr(args, "dest_tags", None)
-    dest_tags = [d.strip() for d in _arg_dt.split(",")] if _arg_dt else []
-
-    _arg_st = getattr(args, "src_tags", None)
-    src_tags = [s.strip() for s in _arg_st.split(",")] if _arg_st else []
+    from . import set_dates as set_dates_mod
 
-    _arg_bt = getattr(args, "backups_tags", None)
-    backups_tags = [b.strip() for b in _arg_bt.split(",")] if _arg_bt else []
+    dest_tags = utils.split_csv(getattr(args, "dest_tags", None))
+    src_tags = utils.split_csv(getattr(args, "src_tags", None))
+    backups_tags = utils.split_csv(getattr(args, "backups_tags", None))
 
     _arg_b = getattr(args, "backups_path", None)
     backups_path = Path(_arg_b) if _arg_b else None
@@ -50,11 +73,14 @@ def cmd_set_dates(args):
         dry_run=bool(getattr(args, "dry_run", False)),
         progress=bool(getattr(args, "progress", True)),
         update_systime=bool(getattr(args, "update_systime", False)),
+        workers=getattr(args, "workers", 1),
     )
 
 
 def cmd_transcode(args):
     """Handle the `transcode` subcommand."""
+    from . import transcode as transcode_mod
+
     src_pattern = args.src
     dst_arg = getattr(args, "dst", None)
 
@@ -62,26 +88,23 @@ def cmd_transcode(args):
         min_size_bytes = min_size_mb * 1024 * 1024
         matches = []
         if regex:
-            for f in glob.glob(regex, recursive=True):
-                f = Path(f)
-                if (
-                    f.is_file() and
-                    f.stat().st_size >= min_size_bytes and
-                    "originals" not in str(f) and
-                    "reduced" not in str(f)
-                ):
-                    matches.append(f)
+            found = utils.scan_files(regex)
         else:
-            all_exts = [".mp4", ".avi", ".mkv", ".mov", ".flv", ".wmv"]
-            for ext in all_exts:
-                for f in Path(".").rglob(f"*{ext}", case_sensitive=False):
-                    if (
-                        f.is_file() and
-                        f.stat().st_size >= min_size_bytes and
-                        "originals" not in str(f) and
-                        "reduced" not in str(f)
-                    ):
-                        matches.append(f)
+            # list directories on background threads while we filter files;
+            # earlier outputs and moved originals are not walked at all
+            found = (
+                (f, entry) for f, entry in utils.walk_files(skip_dirs=("originals", "reduced"))
+                if os.path.splitext(entry.name)[1][1:].lower() in _VIDEO_EXTS
+            )
+        for f, entry in found:
+            if "originals" in f or "reduced" in f:
+                continue
+            if min_size_bytes > 0:
+                # the directory entry already knows it is a file; reuse it for the size too
+                st = entry.stat() if entry is not None else os.stat(f)
+                if st.st_size < min_size_bytes:
+                    continue
+            matches.append(Path(f))
         return matches
 
     # If the user passed an explicit existing path, accept it regardless of min-size filtering
@@ -94,18 +117,30 @@ def cmd_transcode(args):
         print(f"No files match pattern: {src_pattern}")
         return
 
+    move_to = Path(args.move_original_to) if args.move_original_to else None
+    options = dict(
+        crf=args.crf,
+        max_width=args.max_width,
+        dry_run=args.dry_run,
+        move_original_to=move_to,
+    )
+    # only pass an encoder when one was asked for
+    if getattr(args, "encoder", None):
+        options["encoder"] = args.encoder
+    threads = getattr(args, "threads", None)
+    if threads:
+        options["threads"] = threads
+
+    # Resolve the dst argument once rather than for every source
+    dstp = Path(dst_arg) if dst_arg else None
+    # If dst looks like a directory (exists as dir or has no suffix), use as directory;
+    # otherwise treat it as a specific file path (only valid when single source)
+    dst_is_dir = dstp is not None and (dstp.is_dir() or dstp.suffix == "")
+
     # Helper to decide destination path for a given source
     def _dst_for(src_path: Path) -> Path:
-        if dst_arg:
-            dstp = Path(dst_arg)
-            # If dst looks like a directory (exists as dir or has no suffix), use as directory
-            if dstp.exists() and dstp.is_dir():
-                return dstp / src_path.name
-            if dstp.suffix == "":
-                # treat as directory (create if needed)
-                return dstp / src_path.name
-            # otherwise treat as specific file path (only valid when single source)
-            return dstp
+        if dstp is not None:
+            return dstp / src_path.name if dst_is_dir else dstp
         # default: place in same dir with '.reduced' inserted before suffix
         return src_path.with_name(f"{src_path.stem}.reduced{args.suffix or src_path.suffix}")
 
@@ -113,21 +148,13 @@ def cmd_transcode(args):
     if len(matches) == 1:
         src_path = Path(matches[0])
         dst_path = _dst_for(src_path)
-        move_to = Path(args.move_original_to) if args.move_original_to else None
-        res = transcode_mod.transcode_video(
-            src_path,
-            dst_path,
-            crf=args.crf,
-            max_width=args.max_width,
-            dry_run=args.dry_run,
-            move_original_to=move_to,
-        )
+        res = transcode_mod.transcode_video(src_path, dst_path, **options)
         if not res:
             raise SystemExit(1)
         return
 
     # multiple matches -> treat dst as directory (or default to each source dir)
-    dest_dir = Path(dst_arg) if dst_arg else None
+    dest_dir = dstp
     if dest_dir and dest_dir.suffix != "":
         # if user passed a file-like dst for many sources, treat its parent as target dir
         dest_dir = dest_dir.parent
@@ -135,24 +162,44 @@ def cmd_transcode(args):
     if dest_dir:
         dest_dir.mkdir(parents=True, exist_ok=True)
 
-    for m in matches:
-        src_path = Path(m)
-        dst_path = _dst_for(src_path)
-        move_to = Path(args.move_original_to) if args.move_original_to else None
-        res = transcode_mod.transcode_video(
-            src_path,
-            dst_path,
-            crf=args.crf,
-            max_width=args.max_width,
-            dry_run=args.dry_run,
-            move_original_to=move_to,
-        )
-        if not res:
-            print(f"transcode failed for {src_path}")
+    def _transcode_one(src_path: Path, dst_path: Path):
+        return src_path, transcode_mod.transcode_video(src_path, dst_path, **options)
+
+    # Sources that map to the same output (same name from several folders)
+    # run one after the other, so a retry's -y can never replace what
+    # another worker just wrote.
+    by_dst = {}
+    for src_path in matches:
+        by_dst.setdefault(_dst_for(src_path), []).append(src_path)
+
+    def _transcode_group(item):
+        dst_path, srcs = item
+        return [_transcode_one(src_path, dst_path) for src_path in srcs]
+
+    workers = getattr(args, "workers", 1)
+    if workers == 0:
+        # ffmpeg already encodes on several threads, so run fewer of them
+        workers = max(1, (os.cpu_count() or 1) // (threads or 4))
+    # the outputs' creation times are set with a few SetFile runs at the end
+    from .set_dates import batched_setfile
+
+    with batched_setfile():
+        if workers == 1:
+            results = (_transcode_one(src_path, _dst_for(src_path)) for src_path in matches)
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                results = [r for group in ex.map(_transcode_group, by_dst.items()) for r in group]
+        for src_path, res in results:
+            if not res:
+                print(f"transcode failed for {src_path}")
 
 
 def cmd_organize(args):
     """Handle the `organize` subcommand."""
+    from . import organize as organize_mod
+
     dest = Path(args.dest_root)
     moves = organize_mod.organize_by_year(
         args.pattern,
@@ -167,18 +214,45 @@ def cmd_search(args):
 
     Delegates to `datefixer.search.search_files` and prints matches.
     """
-    matches = search_mod.search_files(
-        pattern=args.pattern,
-        compare=getattr(args, "compare", None),
-        move_to=getattr(args, "move_to", None),
-        dry_run=bool(getattr(args, "dry_run", False)),
-    )
+    from . import search as search_mod
 
     # If the user supplied a compare expression, extract tag names referenced
     tag_names = search_mod.parse_compare_tag_names(getattr(args, "compare", None))
+    files = utils.expand_pattern(args.pattern)
+
+    # Read the tags once, in a few batched exiftool commands, for both the
+    # compare expression and the printed matches, rather than once per
+    # printed file or once in each step.
+    prefetched = []
+    try:
+        if tag_names and files and search_mod.exiftool.has_exiftool():
+            prefetched = search_mod.exiftool.prefetch_tags(files, chunk_size=500)
+
+        matches = search_mod.search_files(
+            pattern=files,
+            compare=getattr(args, "compare", None),
+            move_to=getattr(args, "move_to", None),
+            dry_run=bool(getattr(args, "dry_run", False)),
+            workers=getattr(args, "workers", 1),
+        )
+
+        if prefetched:
+            # files moved by --move-to are read again under their new path
+            prefetched += search_mod.exiftool.prefetch_tags(matches, chunk_size=500)
+        _print_search_matches(matches, tag_names)
+    finally:
+        search_mod.exiftool.forget_tags(prefetched)
+    print(f"Found {len(matches)} match(es).")
+
 
-    import json
+def _print_search_matches(matches, tag_names):
+    from . import search as search_mod
 
+    # If creation time was requested, attempt to inject it below as
+    # well so CLI output matches the search behavior.
+    wants_create = search_mod._wants_create_date(tag_names or [])
+    # one write per block of matches rather than per line
+    lines = []
     for m in matches:
         # For matched files, if tag names were provided, read EXIF tags and extract only date-like tags
         if tag_names:
@@ -186,45 +260,54 @@ def cmd_search(args):
                 tags = search_mod.exiftool.read_all_tags(m)
             except Exception:
                 tags = {}
-            # If creation time was requested, attempt to inject it here as
-            # well so CLI output matches the search behavior.
-            wants_create = any(("file" in tn.lower() and "create" in tn.lower()) or tn.lower().replace(" ", "") == "file:system:filecreatedate" for tn in tag_names)
             if wants_create:
                 try:
-                    st = Path(m).stat()
-                    birth_ts = getattr(st, "st_birthtime", None)
+                    birth_ts = utils.birthtime(m)
                     if birth_ts is not None:
-                        from datetime import datetime as _dt
-
-                        dt = _dt.fromtimestamp(birth_ts)
+                        dt = datetime.fromtimestamp(birth_ts)
                         tags.setdefault("File:System:FileCreateDate", dt.strftime("%Y:%m:%d %H:%M:%S"))
                 except Exception:
                     pass
 
+            find = search_mod._tag_finder(tags)
             dates = {}
             for tn in tag_names:
-                val = search_mod._find_tag_value(tags, tn)
+                val = find(tn)
                 coerced = search_mod._coerce_value(val)
                 if isinstance(coerced, datetime):
                     dates[tn] = coerced.isoformat()
             if dates:
-                print(f"{m} {json.dumps(dates)}")
+                lines.append(f"{m} {json.dumps(dates)}\n")
             else:
-                print(m)
+                lines.append(f"{m}\n")
         else:
-            print(m)
-    print(f"Found {len(matches)} match(es).")
+            lines.append(f"{m}\n")
+        if len(lines) >= 256:
+            sys.stdout.writelines(lines)
+            lines.clear()
+    sys.stdout.writelines(lines)
+    sys.stdout.flush()
 
 
-def main():
+@functools.cache
+def _build_parser():
+    """Build the argument parser once; repeated ``main()`` calls reuse it."""
     parser = argparse.ArgumentParser(
         prog="datefixer",
         description="Datefixer CLI",
     )
     parser.add_argument(
         "--version",
-        action="version",
-        version=__version__
+        action=_VersionAction
+    )
+    parser.add_argument(
+        "--native-exif",
+        action="store_true",
+        help=(
+            "Read JPEG/TIFF/HEIC dates with the optional exifread package instead of "
+            "exiftool. Faster, but only plain EXIF dates are seen (no XMP, IPTC, "
+            "MakerNotes, QuickTime or Composite tags)."
+        ),
     )
     sub = parser.add_subparsers(dest="cmd")
 
@@ -300,6 +383,15 @@ def main():
             "By default the tool will attempt to preserve system timestamps when possible; use this flag to permit updates."
         ),
     )
+    p_sd.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Number of files to process in parallel when not interactive (0 = one per CPU). "
+            "Files with several candidate dates are still prompted for one at a time."
+        ),
+    )
     p_sd.set_defaults(func=cmd_set_dates)
 
     ###########################################
@@ -314,6 +406,28 @@ def main():
     p_tc.add_argument("--dry-run", action="store_true", help="Print ffmpeg command instead of running it")
     p_tc.add_argument("--suffix", type=str, help="")
     p_tc.add_argument("--move-original-to", help="Optional folder to move original file into after transcode")
+    p_tc.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Number of files to transcode at once (0 = one per four CPUs, or one per "
+            "--threads CPUs, as each ffmpeg is multi-threaded)"
+        ),
+    )
+    p_tc.add_argument(
+        "--threads",
+        type=int,
+        default=None,
+        help="Threads per ffmpeg encode (default: ffmpeg's choice); 2-4 suits running several files at once",
+    )
+    p_tc.add_argument(
+        "--encoder",
+        help=(
+            "ffmpeg HEVC encoder (default: libx265). 'auto' picks a hardware encoder "
+            "(videotoolbox, nvenc, qsv) when ffmpeg offers one"
+        ),
+    )
     p_tc.set_defaults(func=cmd_transcode)
 
     ###########################################
@@ -335,7 +449,9 @@ def main():
         "--compare",
         dest="compare",
         help=("Comparison expression between two EXIF tags, e.g. 'DateTimeOriginal > DateTimeDigitized'. "
-              "Supported operators: > >= < <= == != <>")
+              "Supported operators: > >= < <= == != <>. A tag name matches the first tag whose "
+              "full name contains it (case-insensitive); give the full name, e.g. "
+              "'EXIF:ExifIFD:DateTimeOriginal', to pick one tag.")
     )
     p_search.add_argument(
         "-m",
@@ -348,12 +464,33 @@ def main():
         action="store_true",
         help="Do not move files; only print matches",
     )
+    p_search.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of files to evaluate --compare on in parallel (0 = one per CPU)",
+    )
     p_search.set_defaults(func=cmd_search)
 
     ###########################################
 
+    return parser
+
+
+def main():
+    parser = _build_parser()
     args = parser.parse_args()
     if not hasattr(args, "func"):
         parser.print_help()
         return
-    args.func(args)
+    if not args.native_exif:
+        args.func(args)
+        return
+    # only for this run; main() may be called again in the same process
+    from . import exiftool
+    previous = exiftool.NATIVE_READS
+    exiftool.NATIVE_READS = True
+    try:
+        args.func(args)
+    finally:
+        exiftool.NATIVE_READS = previous
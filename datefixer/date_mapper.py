@@ -9,10 +9,12 @@ these helpers so unit tests can exercise logic without running the
 console command.
 """
 
-from typing import List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
 from datetime import datetime
+from operator import attrgetter
 from pathlib import Path
-import glob
+import os
+import threading
 from . import exiftool, set_dates, exif_setter, utils
 
 ALL_FS_TAGS = {
@@ -23,6 +25,16 @@ ALL_FS_TAGS = {
                                    # supported for convenience with SetFile
 }
 
+# tag selectors meaning "every EXIF and filesystem tag"
+_ALL_TAGS_SELECTORS = frozenset({'*', 'ALL'})
+
+_FS_TAG_DISPATCH = {
+    'File:System:FileAccessDate': attrgetter('st_atime'),  # File Accessed
+    'File:System:FileModifyDate': attrgetter('st_mtime'),  # File Modified
+    'File:System:FileInodeChangeDate': attrgetter('st_ctime'),  # File Changed
+    'File:System:FileCreateDate': attrgetter('st_birthtime'),  # File Created
+}
+
 
 def system_tag_to_datetime(
         path: Path,
@@ -37,19 +49,41 @@ def system_tag_to_datetime(
     Returns:
         A :class:`datetime.datetime` instance or ``None`` if unavailable.
     """
-    st = path.stat()
-
-    match tag:
-        case 'File:System:FileAccessDate':
-            return datetime.fromtimestamp(st.st_atime)  # File Accessed
-        case 'File:System:FileModifyDate':
-            return datetime.fromtimestamp(st.st_mtime)  # File Modified
-        case 'File:System:FileInodeChangeDate':
-            return datetime.fromtimestamp(st.st_ctime)  # File Changed
-        case 'File:System:FileCreateDate':
-            return datetime.fromtimestamp(st.st_birthtime)  # File Created
-        case _:
-            return None
+    return _fs_tag_from_stat(os.stat(path), tag, path)
+
+
+def _fs_tag_from_stat(
+        st: os.stat_result,
+        tag: str,
+        path: Optional[Path] = None
+) -> Optional[datetime]:
+    """Return the datetime for filesystem ``tag`` from an existing stat result.
+
+    With ``path``, the creation time is also found where the stat result
+    lacks ``st_birthtime`` (see :func:`utils.birthtime`).
+    """
+    if tag == 'File:System:FileCreateDate' and path is not None:
+        ts = utils.birthtime(path, st)
+        return datetime.fromtimestamp(ts) if ts is not None else None
+    get_ts = _FS_TAG_DISPATCH.get(tag)
+    if get_ts is None:
+        return None
+    try:
+        return datetime.fromtimestamp(get_ts(st))
+    except AttributeError:
+        # st_birthtime is only provided on some platforms (macOS, BSD)
+        return None
+
+
+def needs_exif(tags: Optional[List[str]]) -> bool:
+    """Return True when the tag selectors ``tags`` need the file's EXIF tags.
+
+    Selectors naming only ``File:System:`` tags are served from ``stat``
+    alone, so exiftool does not have to read those files.
+    """
+    if not tags:
+        return False
+    return tags[0] in _ALL_TAGS_SELECTORS or any(t not in ALL_FS_TAGS for t in tags)
 
 
 def candidates_for_file(
@@ -59,24 +93,29 @@ def candidates_for_file(
 ) -> List[Tuple[str, datetime]]:
     if not len(tags) > 0:
         return []
-    use_all_tags = tags[0] in ['*', 'ALL']
+    use_all_tags = tags[0] in _ALL_TAGS_SELECTORS
 
     candidates = []
-    file_exif_tags = exiftool.read_all_tags(path)
+    file_exif_tags = exiftool.read_all_tags(path) if needs_exif(tags) else {}
+    # one stat serves every filesystem tag of this file
+    st = None
 
     if use_all_tags:
         for tag, dt_str in file_exif_tags.items():
             dt = utils.parse_date(dt_str)
             if dt:
                 candidates.append((f"{prefix}{tag}", dt))
+        st = os.stat(path)
         for tag in ALL_FS_TAGS:
-            dt = system_tag_to_datetime(path, tag)
+            dt = _fs_tag_from_stat(st, tag, path)
             if dt:
                 candidates.append((f"{prefix}{tag}", dt))
     else:
         for tag in tags:
             if tag in ALL_FS_TAGS:
-                dt = system_tag_to_datetime(path, tag)
+                if st is None:
+                    st = os.stat(path)
+                dt = _fs_tag_from_stat(st, tag, path)
                 if dt:
                     candidates.append((f"{prefix}{tag}", dt))
             elif tag in file_exif_tags:
@@ -117,24 +156,120 @@ def gather_candidates(
     """
     # Collect candidate datetimes from EXIF, filesystem, and backup files.
     # Each candidate is a tuple (description, datetime).
-    candidates = candidates_for_file(path, src_tags, prefix=f'{path.name}: ')
+    name = os.path.basename(path)
+    candidates = candidates_for_file(path, src_tags, prefix=f'{name}: ')
 
     # If a reference backups folder is provided, try to find matching
     # filenames under it (recursive) and extract times from those files.
     if backups_path:
         if backups_tags is None:
             backups_tags = ['*']
-        matches = glob.glob(
-            str(Path(backups_path) / "**" / path.name), recursive=True
-        )
-        for file in matches:
+        for file, rel in backups_index(backups_path).get(name, ()):
             candidates += candidates_for_file(
-                path, backups_tags,
-                prefix=f"{Path(file).relative_to(backups_path.parent)}: "
+                file, backups_tags, prefix=f"{rel}: "
             )
     return candidates
 
 
+def gather_candidates_many(
+    paths: Iterable[Path],
+    src_tags: List[str],
+    backups_path: Optional[Path] = None,
+    backups_tags: Optional[List[str]] = None
+) -> Dict[str, List[Tuple[str, datetime]]]:
+    """Collect candidate datetimes for many files at once.
+
+    Like calling :func:`gather_candidates` for each of ``paths``, but the
+    tags of all the files and of their matching backups are read up front
+    in a few batched exiftool commands instead of one request per file.
+
+    Returns:
+        A dict mapping ``str(path)`` to its list of candidates.
+    """
+    paths = [str(p) for p in paths]
+    wanted = paths if needs_exif(src_tags) else []
+    if needs_exif(['*'] if backups_tags is None else backups_tags):
+        wanted = wanted + matching_backups(paths, backups_path)
+    # only forget what this call read; the caller may have prefetched too
+    prefetched = exiftool.prefetch_tags(wanted)
+    try:
+        return {
+            p: gather_candidates(
+                p, src_tags, backups_path=backups_path, backups_tags=backups_tags
+            )
+            for p in paths
+        }
+    finally:
+        exiftool.forget_tags(prefetched)
+
+
+def matching_backups(paths: Iterable[Path], backups_path: Optional[Path]) -> List[str]:
+    """Return the files below ``backups_path`` named like any of ``paths``."""
+    if not backups_path:
+        return []
+    index = backups_index(backups_path)
+    found = []
+    for name in {os.path.basename(p) for p in paths}:
+        found.extend(file for file, _rel in index.get(name, ()))
+    return found
+
+
+# Indexes built by :func:`backups_index`, keyed by ``str(backups_path)``.
+_BACKUPS_INDEXES: Dict[str, Dict[str, List[Tuple[str, str]]]] = {}
+_BACKUPS_LOCK = threading.Lock()
+
+
+def _index_dir(dirpath: str, rel: str, index: Dict[str, List[Tuple[str, str]]]):
+    subdirs = []
+    try:
+        with os.scandir(dirpath) as it:
+            for entry in it:
+                if entry.is_dir():
+                    # like glob's "**", do not descend into hidden directories
+                    if not entry.name.startswith("."):
+                        subdirs.append(entry.name)
+                elif entry.is_file():
+                    index.setdefault(entry.name, []).append(
+                        (entry.path, os.path.join(rel, entry.name)))
+    except OSError:
+        return
+    for d in subdirs:
+        _index_dir(os.path.join(dirpath, d), os.path.join(rel, d), index)
+
+
+def backups_index(backups_path: Path) -> Dict[str, List[Tuple[str, str]]]:
+    """Return the files below ``backups_path`` grouped by file name.
+
+    The tree is walked once per ``backups_path`` and the result is kept
+    until :func:`forget_backups_index` is called, so looking up the
+    backups of each source file is a dict lookup instead of a recursive
+    glob over the whole tree.
+
+    Args:
+        backups_path: Folder with reference files.
+
+    Returns:
+        A dict mapping a file name to ``(path, relative)`` pairs, where
+        ``relative`` is the path relative to the parent of
+        ``backups_path`` (e.g. ``backups/2020/a.jpg``). Pairs are in the
+        order ``glob.glob(backups_path/**/name)`` would return them.
+    """
+    key = str(backups_path)
+    with _BACKUPS_LOCK:
+        index = _BACKUPS_INDEXES.get(key)
+        if index is None:
+            index = {}
+            _index_dir(key, Path(backups_path).name, index)
+            _BACKUPS_INDEXES[key] = index
+    return index
+
+
+def forget_backups_index():
+    """Drop the indexes built by :func:`backups_index`."""
+    with _BACKUPS_LOCK:
+        _BACKUPS_INDEXES.clear()
+
+
 def apply_destinations(
     path: Path,
     dests: List[str],
@@ -148,15 +283,18 @@ def apply_destinations(
         (creation/modification). When False (default), attempt to
         preserve system timestamps where supported.
     """
+    # Write all EXIF destinations with one exiftool call, then the
+    # filesystem times so the exiftool rewrite cannot clobber them.
+    dt_str = dt.strftime("%Y:%m:%d %H:%M:%S")
+    exif_tags = {d: dt_str for d in dests if d not in ALL_FS_TAGS}
+    if exif_tags:
+        # Call the exif_setter with the modern `update_systime` parameter.
+        exif_setter.set_exif_tags(
+            path, exif_tags, dry_run=dry_run,
+            update_systime=update_systime)
     for d in dests:
         if d in ALL_FS_TAGS:
             set_dates.apply_system_time(path, d, dt, dry_run=dry_run)
-        else:
-            dt_str = dt.strftime("%Y:%m:%d %H:%M:%S")
-            # Call the exif_setter with the modern `update_systime` parameter.
-            exif_setter.set_exif_tags(
-                path, {d: dt_str}, dry_run=dry_run,
-                update_systime=update_systime)
 
 
 def interactive_choose(
@@ -170,18 +308,13 @@ def interactive_choose(
     file_label = first_desc.split(":", 1)[0]
 
     # Group tags by unique datetime preserving input order
-    options: List[Tuple[datetime, List[str]]] = []
-    seen = {}
+    by_dt: Dict[datetime, List[str]] = {}
     for desc, dt in cands:
         # tag portion after first ': '
         parts = desc.split(": ", 1)
         tag = parts[1] if len(parts) > 1 else desc
-        key = dt
-        if key in seen:
-            seen[key].append(tag)
-        else:
-            seen[key] = [tag]
-            options.append((dt, [tag]))
+        by_dt.setdefault(dt, []).append(tag)
+    options: List[Tuple[datetime, List[str]]] = list(by_dt.items())
 
     print(f"{file_label}:")
     for i, (dt, tags) in enumerate(options):
@@ -1,11 +1,28 @@
 """Helpers to write EXIF tags using exiftool."""
-import shutil
 import subprocess
 from pathlib import Path
+from typing import List
+from . import exiftool
 
 
 def has_exiftool():
-    return shutil.which("exiftool") is not None
+    return exiftool.has_exiftool()
+
+
+def _write_args(path: Path, tags: dict, update_systime: bool) -> List[str]:
+    """Return the exiftool arguments that write ``tags`` to ``path``."""
+    # When update_systime is False we try to preserve system timestamps.
+    sub_cmd = 'overwrite_original_in_place'
+    if update_systime:
+        sub_cmd = 'overwrite_original'
+    args = [f"-{sub_cmd}"]
+    if not update_systime:
+        # -P preserves the file modification time (mtime)
+        args.append("-P")
+    for tag, val in tags.items():
+        args.append(f"-{tag}={val}")
+    args.append(str(path))
+    return args
 
 
 def set_exif_tags(
@@ -33,17 +50,7 @@ def set_exif_tags(
     """
     if not has_exiftool():
         raise RuntimeError("exiftool not found on PATH")
-    # When update_systime is False we try to preserve system timestamps.
-    sub_cmd = 'overwrite_original_in_place'
-    if update_systime:
-        sub_cmd = 'overwrite_original'
-    cmd = ["exiftool", f"-{sub_cmd}"]
-    if not update_systime:
-        # -P preserves the file modification time (mtime)
-        cmd.append("-P")
-    for tag, val in tags.items():
-        cmd.append(f"-{tag}={val}")
-    cmd.append(str(path))
+    cmd = ["exiftool"] + _write_args(path, tags, update_systime)
 
     if dry_run:
         # Dry run prints the command instead of executing it so tests and
@@ -52,4 +59,5 @@ def set_exif_tags(
         return True
 
     subprocess.run(cmd, check=True)
+    exiftool.forget_tags([path])
     return True
@@ -5,26 +5,422 @@ binary. Reading functions return plain Python mappings (dictionaries)
 or ``None`` so callers can gracefully fall back to filesystem-based
 timestamps when exiftool is not available or fails.
 """
+import atexit
+import functools
 import json
+import logging
+import os
 import shutil
 import subprocess
-from typing import Dict
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
 from .utils import parse_date
 from datetime import datetime, timezone
 
 
+try:
+    # orjson is an optional, much faster JSON decoder (pip install datefixer[fast])
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - depends on the environment
+    _json_loads = json.loads
+
+try:
+    # exifread reads EXIF in-process, without starting exiftool (pip install datefixer[native])
+    import exifread as _exifread
+    # it logs a warning for every file without EXIF; exiftool takes those over
+    logging.getLogger("exifread").setLevel(logging.ERROR)
+except ImportError:  # pragma: no cover - depends on the environment
+    _exifread = None
+
+READ_ARGS = ["-time:all", "-a", "-G0:1", "-s", "-j"]
+
+# Extensions of files known to carry no embedded dates (Takeout JSON
+# sidecars, text files, ...). exiftool would only report their
+# File:System times, which stat gives without a round trip. Every other
+# file, including media types not listed anywhere here, goes to exiftool.
+_NON_MEDIA_EXTS = frozenset({".json", ".txt", ".csv", ".log", ".md"})
+
+# Tags prefetched by :func:`prefetch_tags`, keyed by ``str(path)`` and
+# validated like ``_READ_CACHE`` below, so a file whose times were set
+# since (os.utime, SetFile) is read again.
+_TAGS_CACHE: Dict[str, Tuple[Optional[tuple], dict]] = {}
+
+# Recently read tags, keyed by ``str(path)`` and validated against the
+# file's size, mtime and ctime. ctime is included because writes with
+# ``-P`` keep the mtime, but the kernel always moves the ctime.
+_READ_CACHE: "OrderedDict[str, Tuple[tuple, dict]]" = OrderedDict()
+_READ_CACHE_SIZE = 2048
+_READ_CACHE_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
 def has_exiftool():
-    """Return ``True`` when the ``exiftool`` binary is found on PATH."""
+    """Return ``True`` when the ``exiftool`` binary is found on PATH.
+
+    PATH is searched once per process; call ``has_exiftool.cache_clear()``
+    after changing it.
+    """
     return shutil.which("exiftool") is not None
 
 
+def is_media(path) -> bool:
+    """Return ``False`` when ``path`` is a file known to carry no embedded dates."""
+    return os.path.splitext(path)[1].lower() not in _NON_MEDIA_EXTS
+
+
+# Read JPEG, TIFF and HEIC files with exifread instead of exiftool. Off by
+# default: see :func:`_native_read_tags` for the tags this leaves out.
+NATIVE_READS = False
+
+# Formats whose dates live in plain EXIF, which exifread handles well.
+# RAW and video files are always left to exiftool.
+_NATIVE_EXTS = frozenset({".jpg", ".jpeg", ".tif", ".tiff", ".heic"})
+
+# exifread tag names and their exiftool ``-G0:1 -s`` equivalents.
+_NATIVE_TAG_NAMES = {
+    "Image DateTime": "EXIF:IFD0:ModifyDate",
+    "EXIF DateTimeOriginal": "EXIF:ExifIFD:DateTimeOriginal",
+    "EXIF DateTimeDigitized": "EXIF:ExifIFD:CreateDate",
+    "EXIF OffsetTime": "EXIF:ExifIFD:OffsetTime",
+    "EXIF OffsetTimeOriginal": "EXIF:ExifIFD:OffsetTimeOriginal",
+    "EXIF OffsetTimeDigitized": "EXIF:ExifIFD:OffsetTimeDigitized",
+    "EXIF SubSecTime": "EXIF:ExifIFD:SubSecTime",
+    "EXIF SubSecTimeOriginal": "EXIF:ExifIFD:SubSecTimeOriginal",
+    "EXIF SubSecTimeDigitized": "EXIF:ExifIFD:SubSecTimeDigitized",
+    "GPS GPSDate": "EXIF:GPS:GPSDateStamp",
+    "Thumbnail DateTime": "EXIF:IFD1:ModifyDate",
+}
+
+
+def _system_time(ts: float) -> str:
+    """Format ``ts`` like exiftool's ``File:System`` times."""
+    s = datetime.fromtimestamp(ts).astimezone().strftime("%Y:%m:%d %H:%M:%S%z")
+    return f"{s[:-2]}:{s[-2:]}"
+
+
+def _system_tags(path, st: os.stat_result) -> dict:
+    """Return the ``File:System`` times exiftool would report for ``path``."""
+    return {
+        "SourceFile": str(path),
+        "File:System:FileModifyDate": _system_time(st.st_mtime),
+        "File:System:FileAccessDate": _system_time(st.st_atime),
+        "File:System:FileInodeChangeDate": _system_time(st.st_ctime),
+    }
+
+
+def _non_media_tags(path) -> dict:
+    """Return the tags of a file :func:`is_media` rejects, without exiftool.
+
+    Like exiftool's output for such a file, apart from its non-time
+    ``File`` tags: the ``File:System`` times when exiftool is installed,
+    and an empty mapping otherwise.
+    """
+    if not has_exiftool():
+        return {}
+    try:
+        return _system_tags(path, os.stat(path))
+    except OSError:
+        return {}
+
+
+def _native_read_tags(path) -> Optional[dict]:
+    """Read the dates of ``path`` in-process, or return ``None`` to use exiftool.
+
+    Only JPEG, TIFF and HEIC files are read, only when :data:`NATIVE_READS`
+    is set and the optional ``exifread`` package is installed. Tags are
+    named as exiftool would name them and the ``File:System`` times are
+    added from ``stat``, but the result is narrower than exiftool's: only
+    the EXIF tags in ``_NATIVE_TAG_NAMES`` are read, so XMP, IPTC,
+    MakerNotes, ICC_Profile, QuickTime and Composite dates are missing.
+    Files without EXIF dates return ``None`` so exiftool can still look
+    for XMP or other metadata.
+    """
+    if (
+        not NATIVE_READS
+        or _exifread is None
+        or os.path.splitext(path)[1].lower() not in _NATIVE_EXTS
+    ):
+        return None
+    try:
+        with open(path, "rb") as fh:
+            raw = _exifread.process_file(fh, details=False)
+            st = os.fstat(fh.fileno())
+    except Exception:
+        return None
+    exif = {}
+    for name, tag in _NATIVE_TAG_NAMES.items():
+        value = raw.get(name)
+        if value is not None:
+            exif[tag] = str(value).strip()
+    if not exif:
+        return None
+    tags = _system_tags(path, st)
+    tags.update(exif)
+    return tags
+
+
+def _argfile_arg(arg: str) -> str:
+    """Return ``arg`` as it has to be written to an exiftool argfile line.
+
+    exiftool strips the whitespace around each argfile line and skips
+    lines starting with ``#``. Only a relative path can start like that,
+    so such an argument is passed as ``./arg`` instead. Arguments an
+    argfile cannot carry at all (line breaks, trailing whitespace) raise
+    ``ValueError``.
+    """
+    if arg[:1].isspace() or arg.startswith("#"):
+        arg = "./" + arg
+    if "\n" in arg or "\r" in arg or arg != arg.rstrip():
+        raise ValueError(f"exiftool argfiles cannot carry {arg!r}")
+    return arg
+
+
+class ExifTool:
+    """A persistent ``exiftool -stay_open`` process.
+
+    Starting exiftool means starting a Perl interpreter and loading its
+    modules, which costs far more than reading the tags of a single
+    file. This class keeps one process alive and feeds it commands over
+    stdin, separated by ``-execute``; each response ends with a
+    ``{ready}`` line.
+
+    Example:
+        with ExifTool() as et:
+            out = et.execute("-j", "a.jpg")
+    """
+
+    def __init__(self, executable: str = "exiftool"):
+        self.executable = executable
+        self._proc: Optional[subprocess.Popen] = None
+        # one command at a time; responses are not tagged with their command
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self._proc is None:
+            self._proc = subprocess.Popen(
+                [self.executable, "-stay_open", "True", "-@", "-"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                encoding="utf-8",
+            )
+        return self
+
+    def execute(self, *args: str) -> str:
+        """Run one exiftool command and return its stdout."""
+        return "".join(self.execute_lines(*args))
+
+    def execute_lines(self, *args: str) -> Iterator[str]:
+        """Run one exiftool command and yield its stdout lines as they arrive.
+
+        The process is reserved until the generator is exhausted or
+        closed, so consume it before sending another command. Arguments
+        are passed through :func:`_argfile_arg`.
+        """
+        args = [_argfile_arg(a) for a in args]
+        with self._lock:
+            proc = self.start()._proc
+            try:
+                proc.stdin.write("\n".join(args) + "\n-execute\n")
+                proc.stdin.flush()
+                lines = iter(proc.stdout)
+                for line in lines:
+                    if line.rstrip("\r\n") == "{ready}":
+                        return
+                    try:
+                        yield line
+                    except GeneratorExit:
+                        # the caller stopped early; skip the rest of the response
+                        if any(rest.rstrip("\r\n") == "{ready}" for rest in lines):
+                            raise
+                        break
+            except OSError:
+                pass
+            # the process died; drop it so the next command starts a new one
+            self._proc = None
+            proc.kill()
+            raise RuntimeError("exiftool exited unexpectedly")
+
+    def close(self):
+        if self._proc is None:
+            return
+        proc, self._proc = self._proc, None
+        try:
+            proc.stdin.write("-stay_open\nFalse\n")
+            proc.stdin.flush()
+            proc.wait(timeout=5)
+        except Exception:
+            proc.kill()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_SHARED: Optional[ExifTool] = None
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_exiftool() -> ExifTool:
+    """Return the module's persistent :class:`ExifTool`, starting it if needed.
+
+    The process is started on first use and shut down when the
+    interpreter exits.
+    """
+    global _SHARED
+    with _SHARED_LOCK:
+        if _SHARED is None:
+            _SHARED = ExifTool()
+            atexit.register(_SHARED.close)
+        return _SHARED
+
+
+def read_all_tags_batch(
+    paths: Iterable[Path],
+    et: Optional[ExifTool] = None,
+    chunk_size: int = 200,
+) -> Dict[str, dict]:
+    """Return exiftool JSON mappings for many files at once.
+
+    Files :func:`_native_read_tags` can handle (only when
+    :data:`NATIVE_READS` is set) are read in-process; the
+    rest are queried ``chunk_size`` at a time, through ``et`` or the
+    :func:`shared_exiftool` process. Files known to carry no embedded
+    dates (see :func:`is_media`) only get their ``File:System`` times,
+    from ``stat``. Files exiftool cannot read are missing from the result.
+
+    Args:
+        paths: Files to query.
+        et: Optional :class:`ExifTool` to send the commands to.
+        chunk_size: Maximum number of files per exiftool command.
+
+    Returns:
+        A dict mapping each file's ``SourceFile`` (the path as passed in)
+        to its exiftool fields.
+    """
+    result: Dict[str, dict] = {}
+    rest = []
+    for p in paths:
+        p = str(p)
+        if not is_media(p):
+            tags = _non_media_tags(p)
+            if tags:
+                result[p] = tags
+            continue
+        tags = _native_read_tags(p)
+        if tags is None:
+            rest.append(p)
+        else:
+            result[p] = tags
+    if not rest or not has_exiftool():
+        return result
+    # exiftool reports SourceFile as it was sent, which differs for the
+    # paths _argfile_arg rewrites; paths it rejects cannot be read this way
+    sent: Dict[str, str] = {}
+    for p in rest:
+        try:
+            sent[_argfile_arg(p)] = p
+        except ValueError:
+            pass
+    paths = list(sent)
+    if et is None:
+        et = shared_exiftool()
+    for i in range(0, len(paths), chunk_size):
+        try:
+            for entry in _iter_json_records(et.execute_lines(*READ_ARGS, *paths[i:i + chunk_size])):
+                source = entry.get("SourceFile")
+                result[sent.get(source, source)] = entry
+        except Exception:
+            continue
+    return result
+
+
+def _iter_json_records(lines: Iterable[str]) -> Iterator[dict]:
+    """Decode ``exiftool -j`` output one file record at a time.
+
+    exiftool prints each file's object while it works through the
+    command, and every top-level object closes with a ``}`` in the first
+    column (nested values are indented and strings cannot contain raw
+    newlines). Decoding each record as soon as it is complete overlaps
+    the JSON parsing with exiftool reading the next file.
+    """
+    buf: List[str] = []
+    for line in lines:
+        buf.append(line)
+        if line.startswith("}"):
+            record = "".join(buf).strip().lstrip("[").rstrip(",]")
+            buf = []
+            yield _json_loads(record)
+    # anything left over is not laid out as above; decode it in one go
+    rest = "".join(buf).strip()
+    if rest.strip("[]").strip():
+        data = _json_loads(rest)
+        yield from (data if isinstance(data, list) else [data])
+
+
+def prefetch_tags(
+    paths: Iterable[Path],
+    et: Optional[ExifTool] = None,
+    chunk_size: int = 200,
+) -> List[str]:
+    """Read the tags of ``paths`` in bulk for later :func:`read_all_tags` calls.
+
+    Files whose tags are already prefetched are not read again, so a
+    caller can prefetch files that a function it calls prefetches too.
+
+    Returns:
+        The paths (as strings) this call read, for :func:`forget_tags`
+        once they are no longer needed; files prefetched earlier are left
+        to whoever prefetched them.
+    """
+    todo = [str(p) for p in paths if str(p) not in _TAGS_CACHE]
+    if not todo:
+        return []
+    # signatures from before the read: a change during it invalidates the entry
+    sigs = {p: _file_signature(p) for p in todo}
+    for p, tags in read_all_tags_batch(todo, et=et, chunk_size=chunk_size).items():
+        _TAGS_CACHE[p] = (sigs.get(p), tags)
+    return todo
+
+
+def forget_tags(paths: Optional[Iterable[Path]] = None):
+    """Drop prefetched and cached tags for ``paths`` (or all of them when ``None``)."""
+    with _READ_CACHE_LOCK:
+        if paths is None:
+            _TAGS_CACHE.clear()
+            _READ_CACHE.clear()
+            return
+        for p in paths:
+            _TAGS_CACHE.pop(str(p), None)
+            _READ_CACHE.pop(str(p), None)
+
+
+def _file_signature(path: Path) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+
+
 def read_all_tags(path: Path):
     """Return exiftool JSON mapping for ``path``.
 
-    The function runs ``exiftool -time:all -a -G0:1 -s -j`` to obtain
-    JSON output. If exiftool is not available or fails, an empty mapping
-    is returned.
+    The function sends ``-time:all -a -G0:1 -s -j`` to the persistent
+    :func:`shared_exiftool` process to obtain JSON output. If exiftool is
+    not available or fails, an empty mapping is returned. Tags loaded by
+    :func:`prefetch_tags` or read recently are returned without running
+    exiftool again, as long as the file has not changed since. When
+    :data:`NATIVE_READS` is set and the optional ``exifread`` package is
+    installed, JPEG, TIFF and HEIC files are read in-process, with fewer
+    tags (see :func:`_native_read_tags`). Files known to carry no
+    embedded dates (see :func:`is_media`) are not sent to exiftool; they
+    get the ``File:System`` times exiftool would report, from ``stat``.
 
     Args:
         path: Path to the file to query.
@@ -32,25 +428,41 @@ def read_all_tags(path: Path):
     Returns:
         A dict with exiftool fields, or an empty dict on error.
     """
+    key = str(path)
+    if not is_media(key):
+        return _non_media_tags(key)
+    sig = _file_signature(path)
+    cached = _TAGS_CACHE.get(key)
+    if cached is not None and cached[0] == sig:
+        return dict(cached[1])
+    if sig is not None:
+        with _READ_CACHE_LOCK:
+            hit = _READ_CACHE.get(key)
+            if hit is not None and hit[0] == sig:
+                _READ_CACHE.move_to_end(key)
+                return dict(hit[1])
+    tags = _native_read_tags(key)
+    if tags is not None:
+        return tags
     if not has_exiftool():
         return {}
     try:
-        r = subprocess.run(
-            ["exiftool", "-time:all", "-a", "-G0:1", "-s", "-j", str(path)],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL,
-            text=True,
-            check=True,
-        )
-        data = json.loads(r.stdout)
-        return data[0] if data else {}
+        data = _json_loads(shared_exiftool().execute(*READ_ARGS, key))
+        tags = data[0] if data else {}
     except Exception:
         # If exiftool fails for any reason, return an empty mapping so callers
         # can fall back to filesystem-based timestamps.
         return {}
+    if sig is not None and tags:
+        with _READ_CACHE_LOCK:
+            _READ_CACHE[key] = (sig, tags)
+            _READ_CACHE.move_to_end(key)
+            if len(_READ_CACHE) > _READ_CACHE_SIZE:
+                _READ_CACHE.popitem(last=False)
+    return dict(tags)
 
 
-def all_times_from_exiftool(path: Path) -> Dict[str, datetime]:
+def all_times_from_exiftool(path: Path, tags: Optional[dict] = None) -> Dict[str, datetime]:
     """Return all parsed datetimes found in exiftool output.
 
     The function parses all string values returned by ``read_all_tags`` and
@@ -60,12 +472,14 @@ def all_times_from_exiftool(path: Path) -> Dict[str, datetime]:
 
     Args:
         path: Path to the file to inspect.
+        tags: The file's tags when the caller already has them (e.g. from
+            :func:`read_all_tags_batch`); exiftool is then not asked again.
 
     Returns:
         A dict of tag name to timezone-aware :class:`datetime.datetime` in UTC or ``[]`` if
         no parsable times are found.
     """
-    all_tags = read_all_tags(path)
+    all_tags = read_all_tags(path) if tags is None else tags
     if not all_tags:
         return {}
     dt_tags = {}
@@ -81,7 +495,7 @@ def all_times_from_exiftool(path: Path) -> Dict[str, datetime]:
     return dt_tags
 
 
-def earliest_time_from_exiftool(path: Path):
+def earliest_time_from_exiftool(path: Path, tags: Optional[dict] = None):
     """Return the earliest parsed datetime found in exiftool output.
 
     The function parses all string values returned by ``read_all_tags`` and
@@ -91,11 +505,11 @@ def earliest_time_from_exiftool(path: Path):
 
     Args:
         path: Path to the file to inspect.
+        tags: Already read tags of the file, see :func:`all_times_from_exiftool`.
 
     Returns:
         A timezone-aware :class:`datetime.datetime` in UTC or ``None`` if
         no parsable times are found.
     """
-    exif_dates = all_times_from_exiftool(path).values()
-    # Use timestamp-based min to avoid any remaining comparison issues
-    return min(exif_dates, key=lambda d: d.timestamp())
+    # all values are UTC-aware, so they compare directly
+    return min(all_times_from_exiftool(path, tags).values(), default=None)
@@ -3,47 +3,74 @@
 Provide helpers to organize media into year/month folders based on inferred
 dates from filenames or filesystem timestamps.
 """
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import shutil
+import os
 from datetime import datetime
+from typing import Dict, Optional, Tuple
+from . import utils
 
 
-def organize_by_year(pattern: str, dest_root: Path, dry_run: bool = False, birthtime_func=None):
+def organize_by_year(pattern: str, dest_root: Path, dry_run: bool = False, birthtime_func=None, workers: Optional[int] = None):
     """Organize files matching `pattern` into `dest_root` YYYY directories.
 
+    Files are matched like :func:`datefixer.utils.scan_files`, whose
+    directory listings already tell files from directories. Their
+    timestamps are read on a thread pool, which hides the per-file
+    ``stat`` latency on network filesystems. The moves themselves are
+    done in match order afterwards.
+
     Args:
         pattern: Glob pattern to select files (relative to CWD).
         dest_root: Destination root directory where year/month subdirs will be
             created.
         dry_run: If True, only print planned moves and do not perform them.
+        workers: Number of threads used to inspect files (default: up to
+            32, four per CPU).
 
     Returns:
         A list of tuples (src, dst) of planned/made moves.
     """
-    matches = list(Path().glob(pattern))
-    moves = []
-    for p in matches:
-        if not p.is_file():
-            continue
+    year_dirs: Dict[int, Path] = {}
+
+    def _plan(match) -> Optional[Tuple[Path, Path]]:
+        path, entry = match
+        p = Path(path)
         # Allow tests to inject a birthtime function for deterministic
         # behavior. If not provided, fall back to the platform-specific
         # `st_birthtime` or finally the modification time.
         if birthtime_func is not None:
             ts = birthtime_func(p)
         else:
-            st = p.stat()
+            try:
+                st = entry.stat() if entry is not None else os.stat(path)
+            except OSError:
+                return None
             ts = getattr(st, "st_birthtime", None) or getattr(st, "st_mtime", None)
         if ts is None:
-            continue
+            return None
         dt = datetime.fromtimestamp(ts)
-        year = f"{dt.year:04d}"
-        target_dir = dest_root / year
-        target_dir.mkdir(parents=True, exist_ok=True)
-        dst = target_dir / p.name
+        target_dir = year_dirs.get(dt.year)
+        if target_dir is None:
+            # one mkdir per year, not per file; racing threads are harmless
+            target_dir = dest_root / f"{dt.year:04d}"
+            target_dir.mkdir(parents=True, exist_ok=True)
+            year_dirs[dt.year] = target_dir
+        return p, target_dir / p.name
+
+    if workers is None:
+        workers = min(32, (os.cpu_count() or 1) * 4)
+    moves = []
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        planned = list(ex.map(_plan, utils.scan_files(pattern)))
+    for move in planned:
+        if move is None:
+            continue
+        p, dst = move
         if dry_run:
             print(f"DRY RUN: would move {p} -> {dst}")
             moves.append((p, dst))
             continue
-        shutil.move(str(p), str(dst))
+        utils.move_file(p, dst)
         moves.append((p, dst))
     return moves
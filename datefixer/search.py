@@ -5,16 +5,16 @@ and optional move-to behaviour for matched files.
 """
 from __future__ import annotations
 
-import glob
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 import os
 import re
-import shutil
 import operator
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 from . import exiftool
-from .utils import parse_date
+from .utils import birthtime, expand_pattern, move_file, parse_date
 
 _OP_MAP: Dict[str, Callable] = {
     ">": operator.gt,
@@ -27,6 +27,16 @@ _OP_MAP: Dict[str, Callable] = {
 }
 
 _CMP_RE = re.compile(r"^\s*(?P<a>.+?)\s*(?P<op>>=|<=|<>|!=|==|>|<)\s*(?P<b>.+)\s*$")
+_OR_SPLIT_RE = re.compile(r"\s*\|\s*")
+_AND_SPLIT_RE = re.compile(r"\s*&\s*")
+
+# A parsed comparison term: (left side, operator function, right side),
+# or None for a term that does not parse (it never matches).
+_Term = Optional[Tuple[str, Callable, str]]
+
+# A term ready for evaluation: the parsed term plus the values of its
+# left and right sides as literals, used when no tag of that name exists.
+_CompiledTerm = Tuple[str, Callable, str, object, object]
 
 
 def _parse_cmp_expr(expr: str) -> Tuple[str, str, str]:
@@ -36,6 +46,26 @@ def _parse_cmp_expr(expr: str) -> Tuple[str, str, str]:
     return m.group("a"), m.group("op"), m.group("b")
 
 
+def _parse_compare(compare: str) -> List[List[_Term]]:
+    """Parse ``compare`` into OR-ed groups of AND-ed terms.
+
+    ``&`` binds tighter than ``|``. Parsing once per search lets the
+    per-file evaluation skip all regex work.
+    """
+    groups: List[List[_Term]] = []
+    for or_term in _OR_SPLIT_RE.split(compare):
+        if not or_term.strip():
+            continue
+        terms: List[_Term] = []
+        for term in _AND_SPLIT_RE.split(or_term.strip()):
+            if not term.strip():
+                continue
+            m = _CMP_RE.match(term.strip())
+            terms.append((m.group("a").strip(), _OP_MAP[m.group("op")], m.group("b").strip()) if m else None)
+        groups.append(terms)
+    return groups
+
+
 def parse_compare_tag_names(compare: Optional[str]) -> List[str]:
     """Return a list of tag token names referenced in a compare expression.
 
@@ -46,15 +76,11 @@ def parse_compare_tag_names(compare: Optional[str]) -> List[str]:
     if not compare:
         return []
     tags: List[str] = []
-    or_terms = [t.strip() for t in re.split(r"\s*\|\s*", compare) if t.strip()]
-    for or_term in or_terms:
-        and_terms = [t.strip() for t in re.split(r"\s*&\s*", or_term) if t.strip()]
-        for term in and_terms:
-            m = _CMP_RE.match(term)
-            if not m:
+    for terms in _parse_compare(compare):
+        for term in terms:
+            if term is None:
                 continue
-            a = m.group("a").strip()
-            b = m.group("b").strip()
+            a, _op, b = term
             if a not in tags:
                 tags.append(a)
             if b not in tags:
@@ -77,6 +103,46 @@ def _find_tag_value(tags: Dict[str, object], name: str) -> Optional[str]:
     return None
 
 
+def _tag_finder(tags: Dict[str, object]) -> Callable[[str], Optional[str]]:
+    """Return a :func:`_find_tag_value` bound to ``tags`` for repeated lookups.
+
+    Names match like :func:`_find_tag_value`: case-insensitively, as a
+    substring of the tag key, taking the first key in ``tags`` that
+    contains the name. A short name such as ``Date`` therefore matches
+    whichever date tag comes first; a full key such as
+    ``EXIF:ExifIFD:DateTimeOriginal`` picks exactly that tag.
+
+    The tag keys are lowercased once, and each name's result is remembered,
+    so looking up several names in the same mapping does not lowercase
+    and rescan every key per name.
+    """
+    keys = [(k.lower(), v) for k, v in tags.items()] if tags else []
+    found: Dict[str, Optional[str]] = {}
+
+    def find(name: str) -> Optional[str]:
+        name_l = name.lower()
+        if name_l not in found:
+            found[name_l] = next(
+                (str(v) if v is not None else None for k, v in keys if name_l in k),
+                None,
+            )
+        return found[name_l]
+
+    return find
+
+
+def _wants_create_date(tag_names: List[str]) -> bool:
+    """Return True when ``tag_names`` refers to the filesystem creation time."""
+    return any(
+        ("file" in tn.lower() and "create" in tn.lower()) or tn.lower().replace(" ", "") == "file:system:filecreatedate"
+        for tn in tag_names
+    )
+
+
+# first characters of anything float() accepts (digits, sign, ".", inf, nan)
+_FLOAT_START = frozenset("+-.0123456789iInN")
+
+
 def _coerce_value(val: Optional[str]):
     if val is None:
         return None
@@ -84,60 +150,112 @@ def _coerce_value(val: Optional[str]):
     dt = parse_date(val)
     if dt:
         return dt
-    # try numeric
-    try:
-        return float(val)
-    except Exception:
-        return val.strip()
-
-
-def _eval_cmp_term(tags: Dict[str, object], term: str) -> bool:
+    # try numeric, but only when float() can accept the string: most
+    # non-date values are plain text and the failing call is not free
+    stripped = val.strip()
+    if stripped[:1] in _FLOAT_START:
+        try:
+            return float(stripped)
+        except ValueError:
+            pass
+    return stripped
+
+
+def _eval_cmp_term(tags: Dict[str, object], term: str, find: Optional[Callable[[str], Optional[str]]] = None) -> bool:
     """Evaluate a single comparison term against exif tags for a file.
 
     `term` can compare two tags or a tag against a literal value. If a
     side is a tag name and a matching tag key is present in `tags`, the
     tag's value is used; otherwise the side is treated as a literal.
+    `find` is an optional :func:`_tag_finder` for `tags`, shared by all
+    terms evaluated against the same file.
     """
+    if find is None:
+        find = _tag_finder(tags)
     m = _CMP_RE.match(term)
     if not m:
         raise ValueError(f"invalid comparison term: {term!r}")
-    a_raw_s = m.group("a").strip()
     op = m.group("op")
-    b_raw_s = m.group("b").strip()
+    opfunc = _OP_MAP.get(op)
+    if not opfunc:
+        raise ValueError(f"unsupported operator: {op}")
+    return _eval_term(find, _compile_term((m.group("a").strip(), opfunc, m.group("b").strip())))
+
+
+def _compile_term(term: Tuple[str, Callable, str]) -> _CompiledTerm:
+    a, opfunc, b = term
+    return a, opfunc, b, _coerce_value(a), _coerce_value(b)
+
+
+def _eval_term(find: Callable[[str], Optional[str]], term: _CompiledTerm) -> bool:
+    """Evaluate a term from :func:`_compile_term` using tag finder ``find``."""
+    a_raw_s, opfunc, b_raw_s, a_literal, b_literal = term
 
     # Resolve tag values if present, otherwise treat as literal
-    a_tag_val = _find_tag_value(tags, a_raw_s)
-    b_tag_val = _find_tag_value(tags, b_raw_s)
+    a_tag_val = find(a_raw_s)
+    b_tag_val = find(b_raw_s)
 
     if a_tag_val is None:
-        a_val_raw = a_raw_s
+        a_val_raw, a_val = a_raw_s, a_literal
     else:
-        a_val_raw = a_tag_val
+        a_val_raw, a_val = a_tag_val, _coerce_value(a_tag_val)
     if b_tag_val is None:
-        b_val_raw = b_raw_s
+        b_val_raw, b_val = b_raw_s, b_literal
     else:
-        b_val_raw = b_tag_val
+        b_val_raw, b_val = b_tag_val, _coerce_value(b_tag_val)
 
-    a_val = _coerce_value(a_val_raw)
-    b_val = _coerce_value(b_val_raw)
-
-    opfunc = _OP_MAP.get(op)
-    if not opfunc:
-        raise ValueError(f"unsupported operator: {op}")
     try:
         return bool(opfunc(a_val, b_val))
     except Exception:
         return bool(opfunc(str(a_val_raw), str(b_val_raw)))
 
 
-def search_files(pattern: str, compare: Optional[str] = None, move_to: Optional[str] = None, dry_run: bool = False) -> List[Path]:
+def _compile_compare(compare: str) -> Callable[[Dict[str, object]], bool]:
+    """Return a predicate telling whether a file's tags satisfy ``compare``.
+
+    The expression is parsed, and the literal value of each side coerced,
+    once; the predicate itself only looks up tags and compares values.
+    """
+    groups = [
+        [None if term is None else _compile_term(term) for term in terms]
+        for terms in _parse_compare(compare)
+    ]
+
+    def matches(tags: Dict[str, object]) -> bool:
+        find = _tag_finder(tags)
+        for terms in groups:
+            for term in terms:
+                try:
+                    res = term is not None and _eval_term(find, term)
+                except Exception:
+                    res = False
+                if not res:
+                    break
+            else:
+                return True
+        return False
+
+    return matches
+
+
+def search_files(
+    pattern: Union[str, Iterable],
+    compare: Optional[str] = None,
+    move_to: Optional[str] = None,
+    dry_run: bool = False,
+    workers: int = 1,
+) -> List[Path]:
     """Search for files matching `pattern` and optional `compare`.
 
     Args:
-        pattern: glob pattern passed to ``glob.glob(..., recursive=True)``.
+        pattern: glob pattern, matched like ``glob.glob(..., recursive=True)``,
+            or a list of files already expanded (see :func:`utils.expand_pattern`).
         compare: optional mini-DSL expression like "Exif:ExifIFD:DateTimeOriginal > DateTimeDigitized".
         move_to: optional directory to move matched files into.
         dry_run: when True, do not actually move files.
+        workers: number of threads evaluating ``compare`` (``0`` means one
+            per CPU). Matched files are always moved one at a time, in
+            pattern order.
 
     Returns:
         List of matched file Paths (after move if applicable).
@@ -147,78 +265,82 @@ def search_files(pattern: str, compare: Optional[str] = None, move_to: Optional[
     # Pre-parse requested tag names once so we can inject filesystem-derived
     # tags (like creation time) when they are referenced by the compare expr.
     requested_tag_names = parse_compare_tag_names(compare)
-
-    for p in glob.glob(pattern, recursive=True):
-        path = Path(p)
-        if not path.is_file():
-            continue
-
+    # Support chaining with | (OR) and & (AND). & has higher precedence.
+    compare_matches = _compile_compare(compare) if compare else None
+    # check once whether a requested tag refers to create/birth time
+    wants_create = _wants_create_date(requested_tag_names)
+
+    def is_match(path: str) -> bool:
+        if compare_matches is None:
+            return True
         tags = exiftool.read_all_tags(path)
         # If the compare expression references the filesystem creation
         # time, inject it into the tags mapping using the conventional
         # 'File:System:FileCreateDate' key so comparisons can use it.
-        # This uses os.stat().st_birthtime on platforms that expose it.
-        if requested_tag_names:
-            # check for a requested tag that refers to create/birth time
-            wants_create = any(
-                ("file" in tn.lower() and "create" in tn.lower()) or tn.lower().replace(" ", "") == "file:system:filecreatedate"
-                for tn in requested_tag_names
-            )
-            if wants_create:
-                try:
-                    st = path.stat()
-                    birth_ts = getattr(st, "st_birthtime", None)
-                    if birth_ts is not None:
-                        from datetime import datetime as _dt
-
-                        dt = _dt.fromtimestamp(birth_ts)
-                        # format similar to EXIF output so parse_date can understand it
-                        tags.setdefault("File:System:FileCreateDate", dt.strftime("%Y:%m:%d %H:%M:%S"))
-                except Exception:
-                    # best-effort injection only; failures should not abort search
-                    pass
-
-        ok = True
-        if compare:
-            # Support chaining with | (OR) and & (AND). & has higher precedence.
-            or_terms = [t.strip() for t in re.split(r"\s*\|\s*", compare) if t.strip()]
-            ok = False
-            for or_term in or_terms:
-                and_terms = [t.strip() for t in re.split(r"\s*&\s*", or_term) if t.strip()]
-                and_ok = True
-                for term in and_terms:
-                    try:
-                        res = _eval_cmp_term(tags, term)
-                    except Exception:
-                        res = False
-                    if not res:
-                        and_ok = False
-                        break
-                if and_ok:
-                    ok = True
-                    break
-
-        if ok:
-            if move_to:
-                dest_root = Path(move_to)
+        # This uses utils.birthtime (st_birthtime or statx) where available.
+        if wants_create:
+            try:
+                birth_ts = birthtime(path)
+                if birth_ts is not None:
+                    dt = datetime.fromtimestamp(birth_ts)
+                    # format similar to EXIF output so parse_date can understand it
+                    tags.setdefault("File:System:FileCreateDate", dt.strftime("%Y:%m:%d %H:%M:%S"))
+            except Exception:
+                # best-effort injection only; failures should not abort search
+                pass
+        return compare_matches(tags)
+
+    # Work on the matched path strings and only build a Path for the
+    # files that end up in the result.
+    paths = expand_pattern(pattern)
+    # Tags are only needed to evaluate the compare expression; read them
+    # for all files in a few batched exiftool commands up front. Tags the
+    # caller prefetched already are reused, and left for it to forget.
+    prefetched = exiftool.prefetch_tags(paths) if compare else []
+    try:
+        if workers != 1 and compare and len(paths) > 1:
+            with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as ex:
+                found = list(ex.map(is_match, paths))
+        else:
+            found = [is_match(path) for path in paths]
+    finally:
+        exiftool.forget_tags(prefetched)
+
+    dest_root = Path(move_to) if move_to else None
+    # Names taken in dest_root, listed once, and the next _N suffix to try
+    # per name, so many files with the same name don't probe _1, _2, ...
+    # over and over.
+    used: Optional[set] = None
+    next_suffix: Dict[str, int] = {}
+    for path, ok in zip(paths, found):
+        if not ok:
+            continue
+        if dest_root is not None:
+            if used is None:
                 dest_root.mkdir(parents=True, exist_ok=True)
-                dest = dest_root / path.name
-                # avoid overwriting
-                if dest.exists():
-                    base, ext = os.path.splitext(path.name)
-                    i = 1
-                    while True:
-                        candidate = f"{base}_{i}{ext}"
-                        dest = dest_root / candidate
-                        if not dest.exists():
-                            break
-                        i += 1
-                if not dry_run:
-                    shutil.move(str(path), str(dest))
-                    matches.append(dest)
-                else:
-                    matches.append(path)
+                with os.scandir(dest_root) as it:
+                    used = {entry.name for entry in it}
+            name = os.path.basename(path)
+            # avoid overwriting; the exists() check covers case-insensitive
+            # filesystems, where the listed names are not the whole story
+            candidate = name
+            if candidate in used or (dest_root / candidate).exists():
+                base, ext = os.path.splitext(name)
+                i = next_suffix.get(name, 1)
+                while True:
+                    candidate = f"{base}_{i}{ext}"
+                    if candidate not in used and not (dest_root / candidate).exists():
+                        break
+                    i += 1
+                next_suffix[name] = i + 1
+            dest = dest_root / candidate
+            if not dry_run:
+                used.add(candidate)
+                move_file(path, dest)
+                matches.append(dest)
             else:
-                matches.append(path)
+                matches.append(Path(path))
+        else:
+            matches.append(Path(path))
 
     return matches
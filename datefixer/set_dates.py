@@ -2,20 +2,55 @@
 import os
 import shutil
 import subprocess
+import sys
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from functools import partial
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List
-from . import date_mapper, exiftool
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from tqdm import tqdm
+from . import date_mapper, exiftool, utils
+
+# APPLIED lines written per stdout write in the non-interactive pass
+_REPORT_BLOCK = 256
+
+# While batched_setfile() is active, FileCreateDate updates are queued
+# here as (path, tag, datetime) and applied together when it exits.
+_SETFILE_QUEUE: Optional[List[Tuple[Path, str, Union[datetime, float]]]] = None
+
+# files per SetFile command, well below the argument length limits
+_SETFILE_CHUNK = 200
+
+
+def _progress_bar(total: int, enabled: bool):
+    """Return a tqdm bar that redraws at most ~500 times per run."""
+    return tqdm(
+        total=total,
+        disable=not enabled,
+        unit="file",
+        miniters=max(1, total // 500),
+        mininterval=0.25,
+        smoothing=0,
+    )
 
 
 def has_setfile():
     return shutil.which("SetFile") is not None
 
 
+def _setfile_date(dt: Union[datetime, float]) -> str:
+    """Format ``dt`` in local time the way ``SetFile -d`` expects it."""
+    if isinstance(dt, datetime):
+        return dt.astimezone().strftime("%m/%d/%Y %H:%M:%S")
+    return time.strftime("%m/%d/%Y %H:%M:%S", time.localtime(dt))
+
+
 def apply_system_time(
         path: Path,
         tag: str,
-        dt: datetime,
+        dt: Union[datetime, float],
         dry_run: bool = False
 ):
     """Apply modification or creation time to ``path``.
@@ -26,7 +61,8 @@ def apply_system_time(
             - File:System:FileModifyDate
             - File:System:FileAccessDate
             - File:System:FileCreateDate
-        dt: Datetime to apply (naive datetimes are treated as local time).
+        dt: Datetime to apply (naive datetimes are treated as local time),
+            or a POSIX timestamp such as ``st_mtime``, which is used as is.
         dry_run: When True, print actions instead of performing them.
 
     On POSIX systems the modification time is set with :func:`os.utime`.
@@ -38,22 +74,121 @@ def apply_system_time(
         if dry_run:
             print(f"DRY RUN: would set mtime, atime for {path} to {dt}")
         else:
-            ts = dt.timestamp()
-            os.utime(path, (ts, ts))
-    elif tag == 'File:System:FileCreateDate' and has_setfile():
-        try:
-            local_str = dt.astimezone().strftime("%m/%d/%Y %H:%M:%S")
-            if dry_run:
-                print(f"DRY RUN: would run SetFile -d '{local_str}' {path}")
+            if isinstance(dt, datetime):
+                # whole seconds and microseconds separately, so the result
+                # is exact instead of going through a float
+                ns = (int(dt.replace(microsecond=0).timestamp()) * 1_000_000_000
+                      + dt.microsecond * 1000)
+                os.utime(path, ns=(ns, ns))
             else:
-                subprocess.run(
-                    ["SetFile", "-d", local_str, str(path)], check=False)
+                os.utime(path, (dt, dt))
+    elif tag == 'File:System:FileCreateDate':
+        if _SETFILE_QUEUE is not None and not dry_run:
+            # SetFile is looked up once, when the queue is applied
+            _SETFILE_QUEUE.append((path, tag, dt))
+        elif has_setfile():
+            try:
+                local_str = _setfile_date(dt)
+                if dry_run:
+                    print(f"DRY RUN: would run SetFile -d '{local_str}' {path}")
+                else:
+                    subprocess.run(
+                        ["SetFile", "-d", local_str, str(path)], check=False)
+            except Exception:
+                pass
+
+
+def apply_system_times_bulk(
+        items: Iterable[Tuple[Path, str, Union[datetime, float]]],
+        dry_run: bool = False
+):
+    """Apply many ``(path, tag, datetime)`` updates like :func:`apply_system_time`.
+
+    Creation times are set with one ``SetFile`` run per distinct date
+    (for up to ``_SETFILE_CHUNK`` files each) instead of one run per file.
+    When a file has several creation times, the last one wins.
+    """
+    created: Dict[str, Union[datetime, float]] = {}
+    for path, tag, dt in items:
+        if tag != 'File:System:FileCreateDate' or dry_run:
+            apply_system_time(path, tag, dt, dry_run=dry_run)
+        else:
+            created.pop(str(path), None)
+            created[str(path)] = dt
+    # one PATH lookup for the whole batch
+    if not created or not has_setfile():
+        return
+    by_date: Dict[str, List[str]] = {}
+    for path, dt in created.items():
+        try:
+            local_str = _setfile_date(dt)
         except Exception:
-            pass
+            continue
+        by_date.setdefault(local_str, []).append(path)
+    for local_str, paths in by_date.items():
+        for i in range(0, len(paths), _SETFILE_CHUNK):
+            try:
+                subprocess.run(
+                    ["SetFile", "-d", local_str, *paths[i:i + _SETFILE_CHUNK]],
+                    check=False)
+            except Exception:
+                pass
+
+
+@contextmanager
+def batched_setfile():
+    """Queue creation time updates and apply them in bulk on exit.
+
+    Inside the block, :func:`apply_system_time` defers ``SetFile`` runs
+    and :func:`apply_system_times_bulk` applies them when it is left, so
+    a pass over many files costs a few ``SetFile`` processes.
+    """
+    global _SETFILE_QUEUE
+    _SETFILE_QUEUE = queued = []
+    try:
+        yield
+    finally:
+        _SETFILE_QUEUE = None
+        apply_system_times_bulk(queued)
+
+
+def _apply_first_candidate(
+    file_to_fix: Path,
+    dest_tags: List[str],
+    src_tags: List[str],
+    backups_path: Optional[Path] = None,
+    backups_tags: Optional[List[str]] = None,
+    dry_run: bool = False,
+    update_systime: bool = False,
+):
+    """Gather candidates for one file and apply the date if unambiguous.
+
+    Returns a ``(candidates, applied_dt)`` tuple. ``applied_dt`` is
+    ``None`` when nothing was applied, either because no candidate was
+    found or because several candidates need a user choice.
+    """
+    candidates = date_mapper.gather_candidates(
+        file_to_fix,
+        src_tags=src_tags,
+        backups_path=backups_path,
+        backups_tags=backups_tags,
+    )
+    if len(candidates) != 1:
+        return candidates, None
+    chosen_dt = candidates[0][1]
+    if chosen_dt:
+        date_mapper.apply_destinations(
+            file_to_fix,
+            dest_tags,
+            chosen_dt,
+            dry_run=dry_run,
+            update_systime=update_systime,
+        )
+    return candidates, chosen_dt
 
 
 def cmd_set_dates(
-    pattern: str,
+    pattern: Union[str, Iterable],
     dest_tags: Optional[List[str]] = None,
     src_tags: Optional[List[str]] = None,
     backups_path: Optional[Path] = None,
@@ -63,6 +198,7 @@ def cmd_set_dates(
     dry_run: bool = False,
     progress: bool = False,
     update_systime: bool = False,
+    workers: int = 1,
 ) -> None:
     """Handle the ``set-dates`` subcommand.
 
@@ -70,77 +206,156 @@ def cmd_set_dates(
     commands ('n'/'p') change which file index will be processed by the
     caller of :func:`date_mapper.interactive_choose`.
     Accepts the individual CLI arguments rather than an argparse Namespace.
+    ``pattern`` may also be a list of files already expanded, such as the
+    result of :func:`datefixer.search.search_files`.
+
+    When ``workers`` is not 1 and ``interactive`` is False, files are first
+    processed on a thread pool of that many workers (``0`` means one per
+    CPU); only files with several candidates are left for the interactive
+    loop.
     """
     # Accept either preprocessed lists/Path or raw strings; be permissive
-    if isinstance(dest_tags, str):
-        dest_tags = [d.strip() for d in dest_tags.split(",") if d.strip()]
-    elif dest_tags is None:
-        dest_tags = []
-
-    if isinstance(src_tags, str):
-        src_tags = [s.strip() for s in src_tags.split(",") if s.strip()]
-    elif src_tags is None:
-        src_tags = []
-
-    if backups_tags is None:
-        backups_tags = []
-    elif isinstance(backups_tags, str):
-        backups_tags = [s.strip() for s in backups_tags.split(",") if s.strip()]
+    if dest_tags is None or isinstance(dest_tags, str):
+        dest_tags = utils.split_csv(dest_tags)
+    if src_tags is None or isinstance(src_tags, str):
+        src_tags = utils.split_csv(src_tags)
+    if backups_tags is None or isinstance(backups_tags, str):
+        backups_tags = utils.split_csv(backups_tags)
 
     if backups_path and not isinstance(backups_path, Path):
         backups_path = Path(backups_path)
 
-    pattern_path = Path(pattern)
-    if pattern_path.is_absolute():
-        parent = pattern_path.parent
-        name = pattern_path.name
-        files = list(parent.glob(name))
-    else:
-        files = list(Path().glob(pattern))
-    files = [f for f in files if f.is_file()]
+    # keep the discovered paths as strings; everything downstream accepts them
+    files = utils.expand_pattern(pattern)
 
-    i = 0
-    while i < len(files):
-        file_to_fix = files[i]
+    # Read the tags of every file, and of the backups matching them,
+    # through one persistent exiftool process up front instead of
+    # spawning exiftool once per file in the loop.
+    prefetched = []
+    if files and exiftool.has_exiftool():
+        wanted = []
+        if show_exiftool or date_mapper.needs_exif(src_tags):
+            wanted = list(files)
+        if backups_path and date_mapper.needs_exif(backups_tags):
+            wanted += date_mapper.matching_backups(files, backups_path)
+        prefetched = exiftool.prefetch_tags(wanted)
 
-        candidates = date_mapper.gather_candidates(
-            file_to_fix,
-            src_tags=src_tags,
-            backups_path=backups_path,
-            backups_tags=backups_tags,
-        )
-
-        force_interactive = interactive
-        if force_interactive or len(candidates) > 1:
-            print(f"\nFile: {file_to_fix}")
-            if show_exiftool:
-                print("EXIFTOOL DUMP:")
-                print(exiftool.read_all_tags(file_to_fix))
-            chosen = date_mapper.interactive_choose(candidates)
-            # interactive_choose may return navigation commands
-            if chosen == 'next':
-                i += 1
-                continue
-            if chosen == 'previous':
-                i = max(0, i - 1)
-                continue
-            if chosen == 'quit':
-                raise SystemExit(0)
-            if chosen is None:
-                print(f"SKIPPED {file_to_fix} (no choice)")
-                i += 1
-                continue
-            chosen_dt = chosen
-        else:
-            chosen_dt = candidates[0][1] if candidates else None
-
-        if chosen_dt:
-            date_mapper.apply_destinations(
-                file_to_fix,
-                dest_tags,
-                chosen_dt,
+    # APPLIED lines wait here until a prompt, a full block or the end of
+    # a pass; dry runs print as they go, next to their DRY RUN lines
+    applied_lines = []
+    try:
+        if workers != 1 and not interactive:
+            apply_one = partial(
+                _apply_first_candidate,
+                dest_tags=dest_tags,
+                src_tags=src_tags,
+                backups_path=backups_path,
+                backups_tags=backups_tags,
                 dry_run=dry_run,
                 update_systime=update_systime,
             )
-            print(f"APPLIED {file_to_fix} -> {chosen_dt}")
-        i += 1
+            ambiguous = []
+            # nothing is prompted here, so write the report in blocks of lines
+            try:
+                # SetFile runs are deferred until every file of the pass is
+                # done, which is still after each file's exiftool rewrite
+                with batched_setfile(), \
+                        ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as ex, \
+                        _progress_bar(len(files), progress) as pbar:
+                    futures = [ex.submit(apply_one, f) for f in files]
+                    error = None
+                    for file_to_fix, future in zip(files, futures):
+                        pbar.update(1)
+                        try:
+                            candidates, applied_dt = future.result()
+                        except CancelledError:
+                            continue
+                        except BaseException as e:
+                            # Keep the first error (or Ctrl-C) for the end.
+                            # Files not started yet are dropped; the ones
+                            # already running still finish and are reported.
+                            if error is None:
+                                error = e
+                                for pending in futures:
+                                    pending.cancel()
+                            continue
+                        if applied_dt:
+                            applied_lines.append(f"APPLIED {file_to_fix} -> {applied_dt}\n")
+                            if dry_run or len(applied_lines) >= _REPORT_BLOCK:
+                                sys.stdout.writelines(applied_lines)
+                                applied_lines.clear()
+                        elif len(candidates) > 1:
+                            ambiguous.append(file_to_fix)
+                    if error is not None:
+                        raise error
+            finally:
+                # report the files already rewritten even if the pass failed
+                sys.stdout.writelines(applied_lines)
+                sys.stdout.flush()
+                applied_lines.clear()
+            files = ambiguous
+
+        pbar = _progress_bar(len(files), progress)
+        # creation times are only set once the pass is over, so keep them
+        # immediate while the user may navigate back to a file
+        with nullcontext() if interactive else batched_setfile():
+            i = 0
+            while i < len(files):
+                # navigation can move backwards, so track the index, not a count
+                pbar.update(i - pbar.n)
+                file_to_fix = files[i]
+
+                candidates = date_mapper.gather_candidates(
+                    file_to_fix,
+                    src_tags=src_tags,
+                    backups_path=backups_path,
+                    backups_tags=backups_tags,
+                )
+
+                force_interactive = interactive
+                if force_interactive or len(candidates) > 1:
+                    sys.stdout.writelines(applied_lines)
+                    applied_lines.clear()
+                    print(f"\nFile: {file_to_fix}")
+                    if show_exiftool:
+                        print("EXIFTOOL DUMP:")
+                        print(exiftool.read_all_tags(file_to_fix))
+                    chosen = date_mapper.interactive_choose(candidates)
+                    # interactive_choose may return navigation commands
+                    if chosen == 'next':
+                        i += 1
+                        continue
+                    if chosen == 'previous':
+                        i = max(0, i - 1)
+                        continue
+                    if chosen == 'quit':
+                        raise SystemExit(0)
+                    if chosen is None:
+                        print(f"SKIPPED {file_to_fix} (no choice)")
+                        i += 1
+                        continue
+                    chosen_dt = chosen
+                else:
+                    chosen_dt = candidates[0][1] if candidates else None
+
+                if chosen_dt:
+                    date_mapper.apply_destinations(
+                        file_to_fix,
+                        dest_tags,
+                        chosen_dt,
+                        dry_run=dry_run,
+                        update_systime=update_systime,
+                    )
+                    applied_lines.append(f"APPLIED {file_to_fix} -> {chosen_dt}\n")
+                    if dry_run or len(applied_lines) >= _REPORT_BLOCK:
+                        sys.stdout.writelines(applied_lines)
+                        applied_lines.clear()
+                i += 1
+        pbar.update(len(files) - pbar.n)
+        pbar.close()
+    finally:
+        # report the files already rewritten even if the pass failed
+        sys.stdout.writelines(applied_lines)
+        sys.stdout.flush()
+        exiftool.forget_tags(prefetched)
+        date_mapper.forget_backups_index()
@@ -6,11 +6,21 @@ timestamps from the source to the destination. The function is intended
 to be used by higher-level scripts; tests can call it with ``dry_run=True``
 to validate argument construction without invoking the binary.
 """
+import functools
 import shutil
 import subprocess
 from pathlib import Path
-from datetime import datetime
 from .set_dates import apply_system_time
+from .utils import move_file
+
+# Hardware HEVC encoders tried by ``encoder="auto"``, best first. VAAPI is
+# left out because it also needs a device and an upload filter.
+_HW_HEVC_ENCODERS = ("hevc_videotoolbox", "hevc_nvenc", "hevc_qsv")
+
+# ``-hwaccel`` decoder to pair with a hardware encoder, so decoding moves
+# off the CPU too. ffmpeg falls back to software decoding for inputs the
+# accelerator cannot handle.
+_HW_DECODERS = {"hevc_nvenc": "cuda", "hevc_videotoolbox": "videotoolbox"}
 
 
 def has_ffmpeg():
@@ -18,6 +28,64 @@ def has_ffmpeg():
     return shutil.which("ffmpeg") is not None
 
 
+@functools.lru_cache(maxsize=1)
+def available_encoders() -> frozenset:
+    """Return the names of the encoders listed by ``ffmpeg -encoders``.
+
+    ffmpeg is asked once per process; an empty set is returned when it
+    cannot be run.
+    """
+    try:
+        out = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            capture_output=True, text=True, check=False,
+        ).stdout
+    except Exception:
+        return frozenset()
+    names = set()
+    for line in out.splitlines():
+        # e.g. " V....D libx265              libx265 H.265 / HEVC"
+        parts = line.split()
+        if len(parts) >= 2 and len(parts[0]) == 6 and parts[0][0] in "VAS":
+            names.add(parts[1])
+    return frozenset(names)
+
+
+def pick_hevc_encoder() -> str:
+    """Return the best HEVC encoder this ffmpeg build offers.
+
+    Hardware encoders are preferred; ``libx265`` is the fallback.
+    """
+    encoders = available_encoders()
+    for name in _HW_HEVC_ENCODERS:
+        if name in encoders:
+            return name
+    return "libx265"
+
+
+def _video_args(encoder: str, crf: int) -> list:
+    """Return the ffmpeg video options for ``encoder`` at quality ``crf``.
+
+    Hardware encoders have no CRF mode; their constant-quality setting is
+    derived from ``crf`` so the same ``--crf`` value gives a comparable
+    (not identical) quality.
+    """
+    if encoder == "hevc_videotoolbox":
+        # -q:v runs 1 (worst) to 100 (best)
+        return ["-c:v", encoder, "-pix_fmt", "yuv420p", "-q:v", str(max(1, min(100, 100 - 2 * crf)))]
+    if encoder == "hevc_nvenc":
+        return ["-c:v", encoder, "-pix_fmt", "yuv420p", "-rc", "vbr", "-cq", str(crf), "-b:v", "0", "-preset", "p5"]
+    if encoder == "hevc_qsv":
+        return ["-c:v", encoder, "-pix_fmt", "nv12", "-global_quality", str(crf), "-preset", "medium"]
+    return [
+        "-c:v", encoder,
+        "-pix_fmt", "yuv420p",
+        "-x265-params", "no-info=1:log-level=error",
+        "-crf", str(crf),
+        "-preset", "medium",
+    ]
+
+
 def transcode_video(
     src: Path,
     dst: Path,
@@ -25,6 +93,8 @@ def transcode_video(
     max_width: int | None = None,
     dry_run: bool = False,
     move_original_to: Path | None = None,
+    encoder: str = "libx265",
+    threads: int | None = None,
 ):
     """Transcode a video and preserve metadata/time information.
 
@@ -36,6 +106,13 @@ def transcode_video(
         max_width: Optional maximum width to scale the output to.
         dry_run: If True, print the ffmpeg command and do not execute it.
         move_original_to: Optional folder to move the original file into.
+        encoder: ffmpeg HEVC encoder to use, or ``"auto"`` for the best
+            one available (see :func:`pick_hevc_encoder`). When a hardware
+            encoder fails, the file is encoded again with ``libx265``,
+            unless ``dst`` already existed before the attempt.
+        threads: Optional number of threads for ffmpeg's encoder. Useful
+            when several files are transcoded at once, as each ffmpeg
+            otherwise sizes its thread pool for the whole machine.
 
     Returns:
         True on success, False if ffmpeg failed. Raises RuntimeError when
@@ -44,54 +121,78 @@ def transcode_video(
     if not has_ffmpeg():
         raise RuntimeError("ffmpeg not found on PATH")
 
-    cmd = [
-        "ffmpeg",
-        "-hide_banner",
-        "-loglevel", "error",
-        "-i", str(src),
-        "-map_metadata", "0",
-        "-c:v", "libx265",
-        "-pix_fmt", "yuv420p",
-        "-x265-params", "no-info=1:log-level=error",
-        "-crf", str(crf),
-        "-preset", "medium",
-        "-c:a", "aac",
-        "-b:a", "128k",
-        "-c:s", "copy",
-        "-map", "0:v?",
-        "-map", "0:a?",
-        "-map", "0:s?",
-    ]
-    if dst.suffix.lower() == ".mp4":
-        cmd += ["-tag:v", "hvc1", "-brand", "mp42", "-movflags", "+faststart"]
+    if encoder == "auto":
+        encoder = pick_hevc_encoder()
+
+    def build_cmd(encoder):
+        cmd = [
+            "ffmpeg",
+            "-hide_banner",
+            # never read keys from the terminal; several ffmpeg processes
+            # may run at once and would take each other's input
+            "-nostdin",
+            "-loglevel", "error",
+        ]
+        if encoder in _HW_DECODERS:
+            cmd += ["-hwaccel", _HW_DECODERS[encoder]]
+        cmd += [
+            "-i", str(src),
+            "-map_metadata", "0",
+            *_video_args(encoder, crf),
+            "-c:a", "aac",
+            "-b:a", "128k",
+            "-c:s", "copy",
+            "-map", "0:v?",
+            "-map", "0:a?",
+            "-map", "0:s?",
+        ]
+        if dst.suffix.lower() == ".mp4":
+            cmd += ["-tag:v", "hvc1", "-brand", "mp42", "-movflags", "+faststart"]
+
+        if max_width:
+            cmd += ["-vf", f"scale=min({max_width},iw):-2"]
 
-    if max_width:
-        cmd += ["-vf", f"scale=min({max_width},iw):-2"]
+        if threads:
+            cmd += ["-threads", str(threads)]
 
-    cmd.append(str(dst))
+        cmd.append(str(dst))
+        return cmd
 
+    cmd = build_cmd(encoder)
     if dry_run:
         print("DRY RUN:", " ".join(cmd))
         return True
 
+    # without -y, ffmpeg refuses to replace an existing dst
+    dst_existed = dst.exists()
     try:
         subprocess.run(cmd, check=True)
     except Exception as e:
-        print("ffmpeg failed:", e)
-        return False
+        if encoder == "libx265" or dst_existed:
+            print("ffmpeg failed:", e)
+            return False
+        # a listed hardware encoder may still lack a usable device
+        print(f"ffmpeg failed with {encoder}, retrying with libx265:", e)
+        # -y: overwrite whatever the failed attempt left behind, which
+        # was not there before it
+        retry = build_cmd("libx265")
+        retry.insert(1, "-y")
+        try:
+            subprocess.run(retry, check=True)
+        except Exception as e:
+            print("ffmpeg failed:", e)
+            return False
 
     try:
         st = src.stat()
-        mtime = datetime.fromtimestamp(st.st_mtime)
-        apply_system_time(dst, 'File:System:FileModifyDate', mtime, dry_run=dry_run)
-        ctime = datetime.fromtimestamp(st.st_birthtime)
-        apply_system_time(dst, 'File:System:FileCreateDate', ctime, dry_run=dry_run)
+        apply_system_time(dst, 'File:System:FileModifyDate', st.st_mtime, dry_run=dry_run)
+        apply_system_time(dst, 'File:System:FileCreateDate', st.st_birthtime, dry_run=dry_run)
     except Exception:
         pass
 
     # move original if requested
     if move_original_to:
         move_original_to.mkdir(parents=True, exist_ok=True)
-        shutil.move(str(src), str(move_original_to / src.name))
+        move_file(src, move_original_to / src.name)
 
     return True
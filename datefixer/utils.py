@@ -6,8 +6,18 @@ timestamps. The functions aim to be robust and fall back to
 ``dateutil.parser`` for tricky inputs.
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+import errno
+import fnmatch
+import functools
+import os
+import queue
 import re
+import shutil
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from dateutil import parser as dparser
 
 EXPLICIT_FORMATS = [
@@ -37,6 +47,134 @@ FILENAME_PATTERNS = [
 ]
 
 
+
+# EXPLICIT_FORMATS grouped by what a string needs to match them: the
+# separator after the year, a "T" between date and time, and whitespace
+# (formats without a space can still match whitespace, as strptime's %d
+# allows a leading blank). Other formats can never match, so only the
+# group of a string's shape is tried, in the original order.
+_FORMATS_BY_SHAPE: Dict[Tuple[str, bool, bool], Tuple[str, ...]] = {}
+for _fmt in EXPLICIT_FORMATS:
+    for _has_ws in {" " in _fmt, True}:
+        _key = (_fmt[2], "T" in _fmt, _has_ws)
+        _FORMATS_BY_SHAPE[_key] = _FORMATS_BY_SHAPE.get(_key, ()) + (_fmt,)
+del _fmt, _has_ws, _key
+
+_FILENAME_PATTERNS = [(re.compile(pat), fmt) for pat, fmt in FILENAME_PATTERNS]
+# Matches wherever any of FILENAME_PATTERNS matches. The patterns are
+# tried in list order (not leftmost first), so this only serves to skip
+# them all at once for names none of them can match.
+_ANY_FILENAME_PATTERN = re.compile("|".join(f"(?:{pat})" for pat, _fmt in FILENAME_PATTERNS))
+_NUMERIC_RE = re.compile(r"\d{1,6}")
+_EXIF_LIKE_RE = re.compile(r"(\d{4}:\d{2}:\d{2} \d{2}:\d{2}:\d{2})(\.?\d+)?(.*)$")
+_EXTENSION_RE = re.compile(r"\.[^.]+$")
+# EXIF timestamp with subseconds and/or a UTC offset, e.g.
+# "2020:01:02 03:04:05.123+01:00" (SubSecDateTimeOriginal)
+_EXIF_SUBSEC_RE = re.compile(
+    r"(\d{4}):(\d\d):(\d\d) (\d\d):(\d\d):(\d\d)(?:\.(\d{1,6}))?(Z|[+-]\d\d:?[0-5]\d)?",
+    re.ASCII,
+)
+# The ISO 8601 shapes handed to datetime.fromisoformat: a date, optionally
+# followed by "T" or a space, a time, subseconds and a UTC offset. Other
+# strings fromisoformat would take (which varies by Python version) go
+# through the format list and dateutil instead.
+_ISO_RE = re.compile(
+    r"\d{4}-\d\d-\d\d(?:[T ]\d\d:\d\d:\d\d(?:\.\d{1,6})?(?:Z|[+-]\d\d:?\d\d)?)?",
+    re.ASCII,
+)
+
+
+def split_csv(s: Optional[str]) -> List[str]:
+    """Split a comma-separated option value into stripped, non-empty items."""
+    if not s:
+        return []
+    return [x.strip() for x in s.split(",") if x.strip()]
+
+
+def move_file(src, dst):
+    """Move file ``src`` to the file path ``dst``.
+
+    Tries a single :func:`os.replace` first and only falls back to
+    :func:`shutil.move` (copy and delete) when ``dst`` is on another
+    filesystem.
+    """
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(str(src), str(dst))
+
+
+# statx(2) mask bit asking for the creation time, and AT_FDCWD
+_STATX_BTIME = 0x800
+_AT_FDCWD = -100
+
+
+@functools.lru_cache(maxsize=1)
+def _statx():
+    """Return libc's ``statx`` bound through ctypes, or None where it is missing."""
+    if not sys.platform.startswith("linux"):
+        return None
+    import ctypes
+
+    class StatxTimestamp(ctypes.Structure):
+        _fields_ = [("tv_sec", ctypes.c_int64), ("tv_nsec", ctypes.c_uint32), ("_reserved", ctypes.c_int32)]
+
+    class Statx(ctypes.Structure):
+        _fields_ = [
+            ("stx_mask", ctypes.c_uint32), ("stx_blksize", ctypes.c_uint32),
+            ("stx_attributes", ctypes.c_uint64), ("stx_nlink", ctypes.c_uint32),
+            ("stx_uid", ctypes.c_uint32), ("stx_gid", ctypes.c_uint32),
+            ("stx_mode", ctypes.c_uint16), ("_spare0", ctypes.c_uint16),
+            ("stx_ino", ctypes.c_uint64), ("stx_size", ctypes.c_uint64),
+            ("stx_blocks", ctypes.c_uint64), ("stx_attributes_mask", ctypes.c_uint64),
+            ("stx_atime", StatxTimestamp), ("stx_btime", StatxTimestamp),
+            ("stx_ctime", StatxTimestamp), ("stx_mtime", StatxTimestamp),
+            ("_spare", ctypes.c_uint64 * 16),
+        ]
+
+    try:
+        func = ctypes.CDLL(None, use_errno=True).statx
+    except (OSError, AttributeError):
+        # glibc before 2.28, or another libc without the wrapper
+        return None
+    func.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_uint, ctypes.POINTER(Statx)]
+    func.restype = ctypes.c_int
+    return func, Statx
+
+
+def birthtime(path, st: Optional[os.stat_result] = None) -> Optional[float]:
+    """Return the creation time of ``path`` as a POSIX timestamp.
+
+    Uses ``st_birthtime`` where ``os.stat`` provides it (macOS, BSD) and
+    ``statx(2)`` on Linux, where ``os.stat`` has no creation time.
+
+    Args:
+        path: File to inspect.
+        st: Optional stat result of ``path`` that was already taken.
+
+    Returns:
+        The timestamp, or ``None`` when the platform or filesystem does not
+        record creation times.
+    """
+    if st is None:
+        st = os.stat(path)
+    ts = getattr(st, "st_birthtime", None)
+    if ts is not None:
+        return ts
+    statx = _statx()
+    if statx is None:
+        return None
+    func, Statx = statx
+    buf = Statx()
+    if func(_AT_FDCWD, os.fsencode(path), 0, _STATX_BTIME, buf) != 0:
+        return None
+    if not buf.stx_mask & _STATX_BTIME:
+        return None
+    return buf.stx_btime.tv_sec + buf.stx_btime.tv_nsec / 1e9
+
+
 def parse_date(s: str) -> datetime | None:
     """Try to parse many EXIF and filename timestamp formats.
 
@@ -47,17 +185,77 @@ def parse_date(s: str) -> datetime | None:
     # Fast path: None or non-string inputs
     if not s or not isinstance(s, str):
         return None
+    return _parse_date_str(s)
+
+
+def _exif_datetime(s: str) -> datetime | None:
+    """Parse exactly ``YYYY:MM:DD HH:MM:SS`` without going through strptime."""
+    if not (
+        len(s) == 19 and s[4] == ":" and s[7] == ":" and s[10] == " "
+        and s[13] == ":" and s[16] == ":"
+    ):
+        return None
+    digits = s[:4] + s[5:7] + s[8:10] + s[11:13] + s[14:16] + s[17:]
+    if not (digits.isascii() and digits.isdigit()):
+        return None
+    try:
+        return datetime(
+            int(s[:4]), int(s[5:7]), int(s[8:10]),
+            int(s[11:13]), int(s[14:16]), int(s[17:]),
+        )
+    except ValueError:
+        # e.g. the "0000:00:00 00:00:00" placeholder; let the general
+        # parsing decide
+        return None
+
+
+def _exif_subsec_datetime(s: str) -> datetime | None:
+    """Parse an EXIF timestamp carrying subseconds and/or a UTC offset."""
+    m = _EXIF_SUBSEC_RE.fullmatch(s)
+    if not m:
+        return None
+    year, month, day, hour, minute, second, frac, tz = m.groups()
+    try:
+        tzinfo = None
+        if tz == "Z":
+            tzinfo = timezone.utc
+        elif tz:
+            offset = timedelta(hours=int(tz[1:3]), minutes=int(tz[-2:]))
+            tzinfo = timezone(-offset if tz[0] == "-" else offset)
+        return datetime(
+            int(year), int(month), int(day),
+            int(hour), int(minute), int(second),
+            int(frac.ljust(6, "0")) if frac else 0, tzinfo,
+        )
+    except ValueError:
+        return None
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_date_str(s: str) -> datetime | None:
     s = s.strip()
+    # The EXIF and ISO 8601 shapes cover nearly every tag value; parse
+    # them directly before trying the format list and dateutil.
+    dt = _exif_datetime(s) or _exif_subsec_datetime(s)
+    if dt is not None:
+        return dt
+    if _ISO_RE.fullmatch(s):
+        try:
+            return datetime.fromisoformat(s)
+        except ValueError:
+            pass
     # ignore small numeric-only values (subseconds)
-    if re.fullmatch(r"\d{1,6}", s):
+    if _NUMERIC_RE.fullmatch(s):
         return None
 
     # common cleanup
     # replace commas
     s2 = s.replace(",", " ")
 
-    # Try explicit formats
-    for fmt in EXPLICIT_FORMATS:
+    # Try the explicit formats that fit the string's shape; strptime
+    # matches case-insensitively and takes any whitespace for a space
+    shape = (s2[4:5], "T" in s2 or "t" in s2, any(c.isspace() for c in s2))
+    for fmt in _FORMATS_BY_SHAPE.get(shape, ()):
         try:
             # Python %z supports offsets like +HHMM or +HH:MM
             dt = datetime.strptime(s2, fmt)
@@ -66,7 +264,7 @@ def parse_date(s: str) -> datetime | None:
             pass
 
     # Try a few heuristics for EXIF-like 'YYYY:MM:DD HH:MM:SS(.sss)(±HH:MM)'
-    m = re.match(r"(\d{4}:\d{2}:\d{2} \d{2}:\d{2}:\d{2})(\.?\d+)?(.*)$", s2)
+    m = _EXIF_LIKE_RE.match(s2)
     if m:
         base = m.group(1)
         frac = m.group(2) or ""
@@ -88,11 +286,13 @@ def parse_date(s: str) -> datetime | None:
     return None
 
 
+@functools.lru_cache(maxsize=4096)
 def infer_from_filename(name: str):
     if not name:
         return None
-    for pat, fmt in FILENAME_PATTERNS:
-        m = re.search(pat, name)
+    patterns = _FILENAME_PATTERNS if _ANY_FILENAME_PATTERN.search(name) else ()
+    for pat, fmt in patterns:
+        m = pat.search(name)
         if m:
             try:
                 group = m.group(1)
@@ -104,8 +304,181 @@ def infer_from_filename(name: str):
                 continue
     # fallback: try dateutil on filename
     # strip extension
-    base = re.sub(r"\.[^.]+$", "", name)
+    base = _EXTENSION_RE.sub("", name)
     try:
         return dparser.parse(base, fuzzy=True)
     except Exception:
         return None
+
+
+def _has_magic(part: str) -> bool:
+    return any(c in part for c in "*?[")
+
+
+def _scandir(dirpath: str) -> List[os.DirEntry]:
+    try:
+        with os.scandir(dirpath or ".") as it:
+            return list(it)
+    except OSError:
+        return []
+
+
+def _join(dirpath: str, name: str) -> str:
+    return os.path.join(dirpath, name) if dirpath else name
+
+
+def _walk_dirs(dirpath: str) -> Iterator[str]:
+    """Yield ``dirpath`` and every non-hidden directory below it."""
+    yield dirpath
+    for entry in _scandir(dirpath):
+        if not entry.name.startswith(".") and entry.is_dir():
+            yield from _walk_dirs(_join(dirpath, entry.name))
+
+
+@functools.lru_cache(maxsize=256)
+def _name_matcher(pattern: str):
+    """Return a compiled ``match`` for the glob component ``pattern``.
+
+    Same rules as :func:`fnmatch.fnmatch`, whose names and pattern are
+    passed through :func:`os.path.normcase`, translated once per pattern.
+    """
+    return re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+
+
+def _match_parts(
+    dirpath: str, parts: List[str]
+) -> Iterator[Tuple[str, Optional[os.DirEntry]]]:
+    head, rest = parts[0], parts[1:]
+    if head == "**":
+        if not rest:
+            rest = ["*"]
+        for d in _walk_dirs(dirpath):
+            yield from _match_parts(d, rest)
+    elif not _has_magic(head):
+        path = _join(dirpath, head)
+        if rest:
+            yield from _match_parts(path, rest)
+        elif os.path.isfile(path):
+            yield path, None
+    else:
+        show_hidden = head.startswith(".")
+        match = _name_matcher(head)
+        for entry in _scandir(dirpath):
+            name = entry.name
+            if name.startswith(".") and not show_hidden:
+                continue
+            if not match(os.path.normcase(name)):
+                continue
+            if rest:
+                if entry.is_dir():
+                    yield from _match_parts(_join(dirpath, name), rest)
+            elif entry.is_file():
+                yield _join(dirpath, name), entry
+
+
+def scan_files(pattern: str) -> Iterator[Tuple[str, Optional[os.DirEntry]]]:
+    """Yield ``(path, entry)`` for regular files matching glob ``pattern``.
+
+    Matches like ``glob.iglob(pattern, recursive=True)`` restricted to
+    files, but walks directories with :func:`os.scandir` so the file/dir
+    checks come from the directory listing instead of a ``stat`` per
+    entry. ``entry`` is the :class:`os.DirEntry` of the file, or ``None``
+    when the last pattern component is a literal name.
+    """
+    drive, rest = os.path.splitdrive(pattern)
+    if os.altsep:
+        rest = rest.replace(os.altsep, os.sep)
+    root = ""
+    if rest.startswith(os.sep):
+        root = drive + os.sep
+    elif drive:
+        root = drive
+    parts = [p for p in rest.split(os.sep) if p]
+    if not parts:
+        return
+    yield from _match_parts(root, parts)
+
+
+def iter_files(pattern: str) -> Iterator[str]:
+    """Yield the paths of regular files matching glob ``pattern``.
+
+    See :func:`scan_files`.
+    """
+    for path, _entry in scan_files(pattern):
+        yield path
+
+
+def expand_pattern(pattern: Union[str, Iterable]) -> List[str]:
+    """Return the files of ``pattern`` as a list of path strings.
+
+    ``pattern`` is either a glob pattern, expanded with
+    :func:`iter_files`, or paths that were already expanded (for example
+    the result of a search), which are used as given. Passing a list lets
+    a script walk the tree once for several commands.
+    """
+    if isinstance(pattern, (str, os.PathLike)):
+        return list(iter_files(os.fspath(pattern)))
+    return [os.fspath(p) for p in pattern]
+
+
+_WALK_DONE = object()
+
+
+def walk_files(
+    root: str = "", workers: int = 8, skip_dirs: Iterable[str] = ()
+) -> Iterator[Tuple[str, os.DirEntry]]:
+    """Yield ``(path, entry)`` for every file below ``root``.
+
+    Like :meth:`pathlib.Path.rglob`, hidden files and directories are
+    included and symlinked directories are not entered.
+
+    Directories are listed on a pool of ``workers`` threads and files are
+    handed back through a queue, so the caller can work on the first files
+    while deeper directories are still being read. This helps most on
+    network or otherwise slow filesystems where each listing is a round
+    trip. The order of the results is not defined.
+
+    Directories whose name is in ``skip_dirs`` are not entered at all.
+    """
+    skip_dirs = frozenset(skip_dirs)
+    found: "queue.Queue" = queue.Queue()
+    lock = threading.Lock()
+    stop = threading.Event()
+    pending = 1
+
+    def list_dir(ex, dirpath):
+        nonlocal pending
+        try:
+            for entry in _scandir(dirpath):
+                if stop.is_set():
+                    break
+                path = _join(dirpath, entry.name)
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in skip_dirs:
+                        continue
+                    with lock:
+                        pending += 1
+                    try:
+                        ex.submit(list_dir, ex, path)
+                    except RuntimeError:
+                        # pool already shut down because the caller stopped
+                        with lock:
+                            pending -= 1
+                elif entry.is_file():
+                    found.put((path, entry))
+        finally:
+            with lock:
+                pending -= 1
+                if pending == 0:
+                    found.put(_WALK_DONE)
+
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        ex.submit(list_dir, ex, root)
+        try:
+            while True:
+                item = found.get()
+                if item is _WALK_DONE:
+                    break
+                yield item
+        finally:
+            stop.set()
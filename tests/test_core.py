@@ -1,7 +1,10 @@
 from datetime import datetime
 import pytest
 from pathlib import Path
+import json
+import os
 import subprocess
+import time
 import sys
 from datefixer import (
     date_mapper,
@@ -52,6 +55,83 @@ def test_gather_candidates_with_backups(monkeypatch, tmp_path):
     assert any(backup_dir.name in desc for desc, _ in res)
 
 
+def test_gather_candidates_reads_backup_file_times(tmp_path):
+    import os
+
+    main = tmp_path / "photo.jpg"
+    main.write_text("x")
+    nested = tmp_path / "bk" / "2019"
+    nested.mkdir(parents=True)
+    b = nested / "photo.jpg"
+    b.write_text("y")
+    old = datetime(2019, 5, 6, 7, 8, 9).timestamp()
+    os.utime(b, (old, old))
+
+    try:
+        res = date_mapper.gather_candidates(
+            main, [], backups_path=tmp_path / "bk",
+            backups_tags=["File:System:FileModifyDate"],
+        )
+    finally:
+        date_mapper.forget_backups_index()
+    assert res == [
+        (os.path.join("bk", "2019", "photo.jpg") + ": File:System:FileModifyDate",
+         datetime(2019, 5, 6, 7, 8, 9)),
+    ]
+
+
+def test_gather_candidates_filesystem_tags_skip_exiftool(monkeypatch, tmp_path):
+    f = tmp_path / "photo.jpg"
+    f.write_text("x")
+
+    def fail(path):
+        raise AssertionError("exiftool should not be asked")
+
+    monkeypatch.setattr(exiftool, "read_all_tags", fail)
+    res = date_mapper.gather_candidates(f, ["File:System:FileModifyDate"])
+    assert [desc for desc, _dt in res] == ["photo.jpg: File:System:FileModifyDate"]
+    assert date_mapper.needs_exif(["File:System:FileModifyDate", "EXIF:CreateDate"])
+    assert date_mapper.needs_exif(["*"]) and not date_mapper.needs_exif([])
+
+
+def test_gather_candidates_many_reads_tags_in_one_batch(monkeypatch, tmp_path):
+    import os
+
+    a = tmp_path / "a.jpg"
+    b = tmp_path / "b.jpg"
+    a.write_text("x")
+    b.write_text("x")
+    (tmp_path / "bk").mkdir()
+    backup = tmp_path / "bk" / "a.jpg"
+    backup.write_text("y")
+
+    batches = []
+
+    def fake_batch(paths, et=None, chunk_size=200):
+        paths = [str(p) for p in paths]
+        batches.append(sorted(paths))
+        return {p: {"EXIF:DateTimeOriginal": "2020:01:01 00:00:00"} for p in paths}
+
+    monkeypatch.setattr(exiftool, "read_all_tags_batch", fake_batch)
+    monkeypatch.setattr(exiftool, "has_exiftool", lambda: False)
+
+    try:
+        res = date_mapper.gather_candidates_many(
+            [a, b], ["EXIF:DateTimeOriginal"], backups_path=tmp_path / "bk",
+            backups_tags=["EXIF:DateTimeOriginal"],
+        )
+    finally:
+        date_mapper.forget_backups_index()
+    assert batches == [sorted([str(a), str(b), str(backup)])]
+    assert [desc for desc, _ in res[str(a)]] == [
+        "a.jpg: EXIF:DateTimeOriginal",
+        os.path.join("bk", "a.jpg") + ": EXIF:DateTimeOriginal",
+    ]
+    assert [desc for desc, _ in res[str(b)]] == ["b.jpg: EXIF:DateTimeOriginal"]
+    # the prefetched tags are not kept around
+    assert exiftool.read_all_tags(backup) == {}
+
+
 def test_apply_destinations_writes_exif(monkeypatch, tmp_path):
     p = tmp_path / "a.jpg"
     p.write_text("x")
@@ -128,6 +208,11 @@ def test_earliest_time_from_exiftool_monkeypatched(monkeypatch):
     assert dt.month == 2
     assert dt.day == 3
 
+    monkeypatch.setattr(exiftool, "read_all_tags", lambda p: {})
+    assert exiftool.earliest_time_from_exiftool(Path("/tmp/photo.jpg")) is None
+    # tags the caller already has are used instead of reading them again
+    assert exiftool.earliest_time_from_exiftool(Path("/tmp/photo.jpg"), sample) == dt
+
 
 def test_interactive_choose_navigation(monkeypatch):
     from datetime import datetime
@@ -144,6 +229,22 @@ def test_interactive_choose_navigation(monkeypatch):
     assert res == 'next'
 
 
+def test_interactive_choose_groups_tags_by_date(monkeypatch, capsys):
+    from datetime import datetime
+    same = datetime(2020, 1, 1)
+    candidates = [
+        ("a.jpg: EXIF:DateTimeOriginal", same),
+        ("a.jpg: EXIF:ModifyDate", datetime(2021, 2, 2)),
+        ("a.jpg: EXIF:CreateDate", same),
+    ]
+    monkeypatch.setattr("builtins.input", lambda prompt='': "1")
+    assert date_mapper.interactive_choose(candidates) == datetime(2021, 2, 2)
+    out = capsys.readouterr().out
+    # both tags with the first date are listed under option 0
+    assert out.index("EXIF:CreateDate") < out.index("option 1")
+    assert out.count("option") == 2
+
+
 def test_cli_transcode_and_organize_monkeypatched(monkeypatch, tmp_path):
     f = tmp_path / "in.mp4"
     f.write_text("x")
@@ -195,9 +296,9 @@ def test_cli_transcode_and_organize_monkeypatched(monkeypatch, tmp_path):
 
 
 def test_cli_search_prints_create_date_real(tmp_path, monkeypatch, capsys):
-    """CLI prints filename followed by JSON with injected create date (real st_birthtime).
+    """CLI prints filename followed by JSON with injected create date (real birthtime).
 
-    This test is skipped on platforms that do not expose `st_birthtime`.
+    This test is skipped where the filesystem does not record creation times.
     """
     from types import SimpleNamespace
     from datefixer import cli as _cli, search as _s
@@ -208,10 +309,10 @@ def test_cli_search_prints_create_date_real(tmp_path, monkeypatch, capsys):
     # stub exiftool to return no tags so injection is necessary
     monkeypatch.setattr(_s.exiftool, "read_all_tags", lambda path: {})
 
-    st = p.stat()
-    birth_ts = getattr(st, "st_birthtime", None)
+    from datefixer import utils as _u
+    birth_ts = _u.birthtime(p)
     if birth_ts is None:
-        pytest.skip("filesystem does not expose st_birthtime on this platform")
+        pytest.skip("filesystem does not record creation times on this platform")
 
     from datetime import datetime, timedelta
     birth_dt = datetime.fromtimestamp(birth_ts)
@@ -265,3 +366,377 @@ def test_cli_search_prints_create_date_monkeypatched(tmp_path, monkeypatch, caps
     data = json.loads(j)
     assert "File:System:FileCreateDate" in data
     assert data["File:System:FileCreateDate"].startswith(birth_dt.isoformat()[:10])
+
+
+def test_prefetched_tags_are_served_from_cache(monkeypatch, tmp_path):
+    p = tmp_path / "c.jpg"
+    p.write_text("x")
+
+    monkeypatch.setattr(
+        exiftool,
+        "read_all_tags_batch",
+        lambda paths, et=None, chunk_size=200: {str(q): {"EXIF:DateTimeOriginal": "2021:02:03 04:05:06"} for q in paths},
+    )
+    monkeypatch.setattr(exiftool, "has_exiftool", lambda: False)
+
+    exiftool.prefetch_tags([p])
+    try:
+        tags = exiftool.read_all_tags(p)
+        assert tags == {"EXIF:DateTimeOriginal": "2021:02:03 04:05:06"}
+        # callers may mutate the returned mapping without touching the cache
+        tags["extra"] = "1"
+        assert "extra" not in exiftool.read_all_tags(p)
+        # setting the file's times (as a File:System destination does)
+        # makes the prefetched tags stale
+        os.utime(p, (0, 0))
+        assert exiftool.read_all_tags(p) == {}
+    finally:
+        exiftool.forget_tags([p])
+    assert exiftool.read_all_tags(p) == {}
+
+
+def test_cli_search_reads_tags_once(monkeypatch, tmp_path, capsys):
+    """The compare pass and the printed matches share one batched read."""
+    from types import SimpleNamespace
+    from datefixer import cli as _cli
+
+    for n in ("a.jpg", "b.jpg"):
+        (tmp_path / n).write_text(n)
+    batches = []
+
+    def fake_batch(paths, et=None, chunk_size=200):
+        batches.append(sorted(Path(q).name for q in paths))
+        return {str(q): {"EXIF:DateTimeOriginal": "2021:02:03 04:05:06"} for q in paths}
+
+    monkeypatch.setattr(exiftool, "read_all_tags_batch", fake_batch)
+    monkeypatch.setattr(exiftool, "has_exiftool", lambda: True)
+    args = SimpleNamespace(
+        pattern=str(tmp_path / "*.jpg"),
+        compare="DateTimeOriginal > 2020:01:01 00:00:00",
+        move_to=None,
+        dry_run=True,
+    )
+    _cli.cmd_search(args)
+
+    assert batches == [["a.jpg", "b.jpg"]]
+    assert "Found 2 match(es)." in capsys.readouterr().out
+    # and nothing is left behind in the cache
+    assert not exiftool._TAGS_CACHE
+
+
+def test_tag_finder_matches_find_tag_value():
+    from datefixer import search as _s
+
+    tags = {
+        "EXIF:ExifIFD:DateTimeOriginal": "2020:01:02 03:04:05",
+        "EXIF:ExifIFD:CreateDate": None,
+        "QuickTime:CreateDate": "2021:01:01 00:00:00",
+    }
+    find = _s._tag_finder(tags)
+    for name in ["datetimeoriginal", "CreateDate", "QuickTime:CreateDate", "missing", "CreateDate"]:
+        assert find(name) == _s._find_tag_value(tags, name)
+    assert _s._tag_finder({})("x") is None
+
+
+def test_exiftool_stay_open_protocol(tmp_path):
+    """`ExifTool.execute` frames commands with -execute and reads up to {ready}."""
+    fake = tmp_path / "fake-exiftool"
+    fake.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        "args = []\n"
+        "for line in sys.stdin:\n"
+        "    line = line.rstrip('\\n')\n"
+        "    if line == '-execute':\n"
+        "        print(' '.join(args)); print('{ready}', flush=True); args = []\n"
+        "    elif line == 'False':\n"
+        "        break\n"
+        "    elif line != '-stay_open':\n"
+        "        args.append(line)\n"
+    )
+    fake.chmod(0o755)
+
+    with exiftool.ExifTool(str(fake)) as et:
+        assert et.execute("-j", "a.jpg") == "-j a.jpg\n"
+        assert et.execute("b.jpg") == "b.jpg\n"
+        # a dead process is replaced on the next command
+        et._proc.kill()
+        et._proc.wait()
+        with pytest.raises(RuntimeError):
+            et.execute("c.jpg")
+        assert et.execute("d.jpg") == "d.jpg\n"
+        # argfile lines lose leading blanks and "#" lines are comments
+        assert et.execute("#1.jpg", " 2.jpg") == "./#1.jpg ./ 2.jpg\n"
+        for bad in ("3.jpg ", "4\n.jpg"):
+            with pytest.raises(ValueError):
+                et.execute(bad)
+
+
+def test_read_all_tags_batch_maps_rewritten_paths_back(monkeypatch):
+    sent = []
+
+    class FakeExifTool:
+        def execute_lines(self, *args):
+            files = args[len(exiftool.READ_ARGS):]
+            sent.extend(files)
+            # laid out like exiftool -j: each record closes in the first column
+            yield "[\n"
+            for i, a in enumerate(files):
+                yield "{" + json.dumps({"SourceFile": a})[1:-1] + "\n"
+                yield "}]\n" if i == len(files) - 1 else "},\n"
+
+    monkeypatch.setattr(exiftool, "has_exiftool", lambda: True)
+    result = exiftool.read_all_tags_batch(["#a.jpg", "b.jpg", "c.jpg "], et=FakeExifTool())
+    assert sent == ["./#a.jpg", "b.jpg"]
+    assert sorted(result) == ["#a.jpg", "b.jpg"]
+
+
+def test_read_all_tags_cached_until_file_changes(monkeypatch, tmp_path):
+    p = tmp_path / "m.jpg"
+    p.write_text("x")
+
+    calls = []
+
+    class FakeExifTool:
+        def execute(self, *args):
+            calls.append(args[-1])
+            return '[{"SourceFile": "%s", "EXIF:DateTimeOriginal": "2020:01:01 00:00:00"}]' % args[-1]
+
+    monkeypatch.setattr(exiftool, "has_exiftool", lambda: True)
+    monkeypatch.setattr(exiftool, "shared_exiftool", lambda: FakeExifTool())
+    exiftool.forget_tags()
+    try:
+        first = exiftool.read_all_tags(p)
+        first["mutated"] = True
+        assert "mutated" not in exiftool.read_all_tags(p)
+        assert len(calls) == 1
+
+        p.write_text("changed")
+        exiftool.read_all_tags(p)
+        assert len(calls) == 2
+
+        exiftool.forget_tags([p])
+        exiftool.read_all_tags(p)
+        assert len(calls) == 3
+    finally:
+        exiftool.forget_tags()
+
+
+def test_search_files_compare_with_stubbed_tags(monkeypatch, tmp_path):
+    from datefixer import search as _s
+
+    tags = {
+        "a.jpg": {"EXIF:ExifIFD:DateTimeOriginal": "2020:01:01 00:00:00", "EXIF:ExifIFD:CreateDate": "2021:01:01 00:00:00"},
+        "b.jpg": {"EXIF:ExifIFD:DateTimeOriginal": "2022:01:01 00:00:00", "EXIF:ExifIFD:CreateDate": "2021:01:01 00:00:00"},
+        "c.jpg": {"EXIF:ExifIFD:DateTimeOriginal": "2023:01:01 00:00:00", "EXIF:ExifIFD:CreateDate": "2024:01:01 00:00:00"},
+    }
+    for name in tags:
+        (tmp_path / name).write_text("x")
+    monkeypatch.setattr(_s.exiftool, "read_all_tags", lambda path: dict(tags[Path(path).name]))
+
+    def names(compare):
+        return sorted(p.name for p in _s.search_files(str(tmp_path / "*.jpg"), compare=compare, dry_run=True))
+
+    assert names(None) == ["a.jpg", "b.jpg", "c.jpg"]
+    assert names("DateTimeOriginal < CreateDate") == ["a.jpg", "c.jpg"]
+    assert names("DateTimeOriginal > CreateDate | DateTimeOriginal < 2020:06:01 00:00:00") == ["a.jpg", "b.jpg"]
+    assert names("DateTimeOriginal > CreateDate & CreateDate == 2021:01:01 00:00:00") == ["b.jpg"]
+
+    # evaluating on a thread pool gives the same matches, in pattern order
+    found = _s.search_files(str(tmp_path / "*.jpg"), compare="DateTimeOriginal < CreateDate", dry_run=True, workers=4)
+    assert [p.name for p in found] == ["a.jpg", "c.jpg"]
+
+
+def test_iter_json_records_splits_exiftool_output():
+    out = '[{\n  "SourceFile": "a.jpg",\n  "X": {\n    "Y": 1\n  }\n},\n{\n  "SourceFile": "b.jpg"\n}]\n'
+    records = exiftool._iter_json_records(out.splitlines(keepends=True))
+    assert next(records) == {"SourceFile": "a.jpg", "X": {"Y": 1}}
+    assert list(records) == [{"SourceFile": "b.jpg"}]
+    # other layouts still decode, just not incrementally
+    pretty = '[\n  {"SourceFile": "c.jpg"}\n]\n'
+    assert list(exiftool._iter_json_records(pretty.splitlines(keepends=True))) == [{"SourceFile": "c.jpg"}]
+    assert list(exiftool._iter_json_records([])) == []
+
+
+def test_non_media_files_skip_exiftool(monkeypatch, tmp_path):
+    sidecar = tmp_path / "IMG_1.jpg.json"
+    sidecar.write_text("{}")
+    photo = tmp_path / "IMG_1.JPG"
+    photo.write_text("x")
+
+    calls = []
+
+    class FakeExifTool:
+        def execute(self, *args):
+            calls.append(args[-1])
+            return '[{"EXIF:DateTimeOriginal": "2020:01:01 00:00:00"}]'
+
+    # a media type no list names is still read by exiftool
+    other = tmp_path / "clip.webm"
+    other.write_text("x")
+
+    monkeypatch.setattr(exiftool, "has_exiftool", lambda: True)
+    monkeypatch.setattr(exiftool, "shared_exiftool", lambda: FakeExifTool())
+    try:
+        # only the File:System times, from stat, as exiftool would report them
+        sidecar_tags = exiftool.read_all_tags(sidecar)
+        assert sorted(sidecar_tags) == [
+            "File:System:FileAccessDate",
+            "File:System:FileInodeChangeDate",
+            "File:System:FileModifyDate",
+            "SourceFile",
+        ]
+        assert exiftool.read_all_tags(photo) == {"EXIF:DateTimeOriginal": "2020:01:01 00:00:00"}
+        assert exiftool.read_all_tags(other) == {"EXIF:DateTimeOriginal": "2020:01:01 00:00:00"}
+    finally:
+        exiftool.forget_tags()
+    assert calls == [str(photo), str(other)]
+    assert exiftool.read_all_tags_batch([sidecar], et=FakeExifTool()) == {str(sidecar): sidecar_tags}
+
+
+def _jpeg_with_exif_dates(path, modify, original):
+    import struct
+
+    def ascii_entry(tag, offset):
+        return struct.pack("<HHII", tag, 2, 20, offset)
+
+    # TIFF header, IFD0 (DateTime + ExifIFD pointer), ExifIFD, strings
+    ifd0 = struct.pack("<H", 2) + ascii_entry(0x0132, 68) + struct.pack("<HHII", 0x8769, 4, 1, 38) + b"\0" * 4
+    exif = struct.pack("<H", 1) + ascii_entry(0x9003, 88) + b"\0" * 4 + b"\0" * 12
+    tiff = b"II*\0" + struct.pack("<I", 8) + ifd0 + exif + modify.encode() + b"\0" + original.encode() + b"\0"
+    app1 = b"Exif\0\0" + tiff
+    path.write_bytes(b"\xff\xd8\xff\xe1" + struct.pack(">H", len(app1) + 2) + app1 + b"\xff\xd9")
+
+
+def test_native_read_tags_uses_exiftool_names(monkeypatch, tmp_path):
+    pytest.importorskip("exifread")
+    p = tmp_path / "n.jpg"
+    _jpeg_with_exif_dates(p, "2019:01:01 10:00:00", "2018:05:06 07:08:09")
+    monkeypatch.setattr(exiftool, "has_exiftool", lambda: False)
+
+    # opt-in only: by default the file is left to exiftool
+    assert exiftool._native_read_tags(p) is None
+    monkeypatch.setattr(exiftool, "NATIVE_READS", True)
+
+    tags = exiftool.read_all_tags(p)
+    assert tags["EXIF:IFD0:ModifyDate"] == "2019:01:01 10:00:00"
+    assert tags["EXIF:ExifIFD:DateTimeOriginal"] == "2018:05:06 07:08:09"
+    assert "File:System:FileModifyDate" in tags
+    assert exiftool.read_all_tags_batch([p]) == {str(p): tags}
+
+    # no EXIF: left to exiftool
+    bare = tmp_path / "bare.jpg"
+    bare.write_bytes(b"\xff\xd8\xff\xd9")
+    assert exiftool._native_read_tags(bare) is None
+
+
+def test_compile_compare_or_of_ands():
+    from datefixer import search as _s
+
+    matches = _s._compile_compare("EXIF:Width > 100 & EXIF:Height > 100 | Rating == 5")
+    assert matches({"EXIF:Width": 200, "EXIF:Height": 150})
+    assert not matches({"EXIF:Width": 200, "EXIF:Height": 50})
+    assert matches({"EXIF:Width": 200, "EXIF:Height": 50, "XMP:Rating": "5"})
+    assert not _s._compile_compare("not a comparison")({"A": 1})
+
+
+def test_search_files_numbers_colliding_moves(tmp_path):
+    from datefixer import search as _s
+
+    for d in ("x", "y", "z"):
+        (tmp_path / "src" / d).mkdir(parents=True)
+        (tmp_path / "src" / d / "a.jpg").write_text(d)
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    (dest / "a_1.jpg").write_text("old")
+
+    moved = _s.search_files(str(tmp_path / "src" / "*" / "a.jpg"), move_to=str(dest))
+    assert sorted(p.name for p in moved) == ["a.jpg", "a_2.jpg", "a_3.jpg"]
+    assert (dest / "a_1.jpg").read_text() == "old"
+    assert sorted(p.read_text() for p in moved) == ["x", "y", "z"]
+
+
+def test_cli_transcode_many_files_with_workers(monkeypatch, tmp_path):
+    for name in ("a.mp4", "b.mp4", "c.mp4"):
+        (tmp_path / name).write_text("x")
+
+    done = []
+
+    def fake_transcode(src, dst, crf=28, max_width=None, dry_run=False, move_original_to=None):
+        done.append(Path(src).name)
+        return Path(src).name != "b.mp4"
+
+    monkeypatch.setattr(trans_mod, 'transcode_video', fake_transcode)
+    monkeypatch.setattr(sys, 'argv', ['datefixer', 'transcode', '*.mp4', '', '--min-size-mb', '0', '--workers', '2'])
+    monkeypatch.chdir(tmp_path)
+    cli.main()
+    assert sorted(done) == ["a.mp4", "b.mp4", "c.mp4"]
+
+
+def test_cli_transcode_workers_serialize_same_output(monkeypatch, tmp_path):
+    for d in ("x", "y"):
+        (tmp_path / d).mkdir()
+        (tmp_path / d / "a.mp4").write_text(d)
+
+    running = []
+    overlapped = []
+
+    def fake_transcode(src, dst, crf=28, max_width=None, dry_run=False, move_original_to=None):
+        overlapped.append(dst in running)
+        running.append(dst)
+        time.sleep(0.05)
+        running.remove(dst)
+        return True
+
+    monkeypatch.setattr(trans_mod, 'transcode_video', fake_transcode)
+    out = tmp_path / "out"
+    monkeypatch.setattr(sys, 'argv', ['datefixer', 'transcode', str(tmp_path / "*" / "a.mp4"), str(out), '--min-size-mb', '0', '--workers', '2'])
+    cli.main()
+    assert overlapped == [False, False]
+
+
+def test_cli_transcode_walk_skips_names_without_extension(monkeypatch, tmp_path):
+    (tmp_path / "clip.MP4").write_text("x")
+    # a file called just "mp4" is not a video
+    (tmp_path / "mp4").write_text("x")
+
+    done = []
+
+    def fake_transcode(src, dst, crf=28, max_width=None, dry_run=False, move_original_to=None):
+        done.append(Path(src).name)
+        return True
+
+    monkeypatch.setattr(trans_mod, 'transcode_video', fake_transcode)
+    monkeypatch.setattr(sys, 'argv', ['datefixer', 'transcode', '', '', '--min-size-mb', '0'])
+    monkeypatch.chdir(tmp_path)
+    cli.main()
+    assert done == ["clip.MP4"]
+
+
+def test_cli_native_exif_only_for_that_run(monkeypatch, tmp_path):
+    seen = []
+    monkeypatch.setattr(cli, "cmd_organize", lambda args: seen.append(exiftool.NATIVE_READS))
+    # the parser is cached; rebuild it so it picks up the patched handler
+    cli._build_parser.cache_clear()
+    try:
+        for argv in (["--native-exif", "organize", "*.jpg", "out"], ["organize", "*.jpg", "out"]):
+            monkeypatch.setattr(sys, "argv", ["datefixer", *argv])
+            cli.main()
+    finally:
+        cli._build_parser.cache_clear()
+    assert seen == [True, False]
+    assert exiftool.NATIVE_READS is False
+
+
+def test_tag_finder_matches_substrings_in_key_order():
+    from datefixer import search as _s
+
+    find = _s._tag_finder({
+        "File:System:FileModifyDate": "2021:01:01 00:00:00",
+        "EXIF:ExifIFD:DateTimeOriginal": "2020:01:01 00:00:00",
+    })
+    # a short name takes the first key containing it
+    assert find("Date") == "2021:01:01 00:00:00"
+    assert find("datetimeoriginal") == "2020:01:01 00:00:00"
+    assert find("EXIF:ExifIFD:DateTimeOriginal") == "2020:01:01 00:00:00"
+    assert find("GPSDateStamp") is None
@@ -1,7 +1,7 @@
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
-import subprocess
 import pytest
+import os
 import shutil
 import sys
 from datefixer import (
@@ -15,6 +15,8 @@ from datefixer import (
 
 
 FIXDIR = Path(__file__).parent / "fixtures"
+# listed once, at collection
+FIXTURE_NAMES = sorted(p.name for p in FIXDIR.iterdir() if p.name != ".gitkeep")
 
 requires_exiftool = pytest.mark.skipif(
     shutil.which("exiftool") is None,
@@ -31,6 +33,23 @@ def copy_fixture_to(path, name):
     return dest
 
 
+def link_fixture_to(path, name):
+    """Like :func:`copy_fixture_to`, for tests that never write the file.
+
+    The fixture is hard linked rather than copied where the filesystem
+    allows it.
+    """
+    src = FIXDIR / name
+    assert src.exists()
+    dest = path / src.name
+    try:
+        os.link(src, dest)
+    except OSError:
+        # another filesystem, or links not permitted
+        shutil.copy2(src, dest)
+    return dest
+
+
 def test_fixtures_exist():
     files = list(FIXDIR.iterdir())
     assert files, "No fixture files found in tests/fixtures"
@@ -50,13 +69,11 @@ def test_infer_from_fixture_filenames():
     assert dt2 is not None and dt2.year == 2025
 
 
-def test_gather_candidates_on_fixtures():
-    for p in FIXDIR.iterdir():
-        if p.name == ".gitkeep":
-            continue
-        candidates = date_mapper.gather_candidates(
-            p, src_tags=[], backups_path=None)
-        assert isinstance(candidates, list)
+@pytest.mark.parametrize("name", FIXTURE_NAMES)
+def test_gather_candidates_on_fixtures(name):
+    candidates = date_mapper.gather_candidates(
+        FIXDIR / name, src_tags=[], backups_path=None)
+    assert isinstance(candidates, list)
 
 
 @requires_exiftool
@@ -107,7 +124,7 @@ def test_exif_set_and_read_enhanced(tmp_path):
 def test_apply_system_time_changes_mtime(tmp_path):
     p = copy_fixture_to(tmp_path, "IMG_20240331_212928.jpg")
     before = p.stat().st_mtime
-    dt = datetime.now() - timedelta(days=365)
+    dt = datetime(2020, 1, 1, 12, 0, 0)
     tag = 'File:System:FileModifyDate'
     set_dates.apply_system_time(p, tag, dt, dry_run=False)
     after = p.stat().st_mtime
@@ -117,7 +134,7 @@ def test_apply_system_time_changes_mtime(tmp_path):
 
 
 def test_gather_with_src_tags(tmp_path):
-    p = copy_fixture_to(tmp_path, "IMG_20240331_212928.jpg")
+    p = link_fixture_to(tmp_path, "IMG_20240331_212928.jpg")
     cands = date_mapper.gather_candidates(
         p, src_tags=['foo:bar', 'EXIF:fakeTag', 'foo', 'd:', ':', '::::'])
     assert len(cands) == 0
@@ -139,8 +156,8 @@ def test_gather_with_src_tags(tmp_path):
 def test_gather_with_backups_behaviour(tmp_path):
     backups_path = tmp_path / "backups123"
     backups_path.mkdir()
-    p = copy_fixture_to(tmp_path, "PXL_20251127_044642542.RAW-01.COVER.jpg")
-    copy_fixture_to(backups_path, "PXL_20251127_044642542.RAW-01.COVER.jpg")
+    p = link_fixture_to(tmp_path, "PXL_20251127_044642542.RAW-01.COVER.jpg")
+    link_fixture_to(backups_path, "PXL_20251127_044642542.RAW-01.COVER.jpg")
     cands = date_mapper.gather_candidates(
         p, src_tags=[], backups_path=backups_path,
         backups_tags=['EXIF:IFD0:ModifyDate'])
@@ -153,8 +170,8 @@ def test_gather_with_backups_no_tags(tmp_path):
     backups_path = tmp_path / "backups456"
     backups_path.mkdir()
     filename = 'PXL_20251127_044642542.RAW-01.COVER.jpg'
-    p = copy_fixture_to(tmp_path, filename)
-    copy_fixture_to(backups_path, filename)
+    p = link_fixture_to(tmp_path, filename)
+    link_fixture_to(backups_path, filename)
     cands = date_mapper.gather_candidates(
         p, src_tags=[], backups_path=backups_path, backups_tags=None)
     assert isinstance(cands, list)
@@ -185,8 +202,8 @@ def test_gather_with_backups_no_tags(tmp_path):
     assert any(backups_path.name in desc for desc, _ in cands)
 
     filename = 'IMG_20240331_212928.jpg'
-    p = copy_fixture_to(tmp_path, filename)
-    copy_fixture_to(backups_path, filename)
+    p = link_fixture_to(tmp_path, filename)
+    link_fixture_to(backups_path, filename)
     cands = date_mapper.gather_candidates(
         p, src_tags=[], backups_path=backups_path, backups_tags=None)
     assert isinstance(cands, list)
@@ -204,7 +221,7 @@ def test_gather_with_backups_no_tags(tmp_path):
 
 
 def test_video_filename_inference_and_gather(tmp_path):
-    p = copy_fixture_to(tmp_path, "Samsung phone 2 2014 010.mp4")
+    p = link_fixture_to(tmp_path, "Samsung phone 2 2014 010.mp4")
     dt = utils.infer_from_filename(p.name)
     assert dt is None or dt.year == 2014
 
@@ -213,11 +230,13 @@ def test_video_filename_inference_and_gather(tmp_path):
     assert isinstance(cands, list)
 
 
-def test_cli_help_runs():
-    cmd = [sys.executable, "-m", "datefixer", "--help"]
-    res = subprocess.run(cmd, capture_output=True, text=True)
-    assert res.returncode == 0
-    assert "set-dates" in res.stdout
+def test_cli_help_runs(monkeypatch, capsys):
+    # in-process: a new interpreter only to print --help costs far more
+    monkeypatch.setattr(sys, "argv", ["datefixer", "--help"])
+    with pytest.raises(SystemExit) as exc:
+        cli.main()
+    assert exc.value.code == 0
+    assert "set-dates" in capsys.readouterr().out
 
 
 def test_set_dates_flow_monkeypatched(monkeypatch, tmp_path):
@@ -16,6 +16,7 @@ Test goals:
 import pytest
 import shutil
 import subprocess
+import time
 from pathlib import Path
 from datetime import datetime, timedelta
 from datefixer import set_dates, date_mapper, exiftool
@@ -289,3 +290,201 @@ def test_cmd_set_dates_empty_pattern_no_candidates(monkeypatch, tmp_path):
 
     # should simply return without error
     set_dates.cmd_set_dates(pattern, interactive=False)
+
+
+def test_cmd_set_dates_workers_apply_and_defer_ambiguous(monkeypatch, tmp_path, capsys):
+    """With workers, unambiguous files are applied and the rest prompted.
+
+    Files with a single candidate are applied on the pool; the file with
+    several candidates is still handed to `interactive_choose`.
+    """
+    for n in ("one.jpg", "two.jpg", "many.jpg"):
+        (tmp_path / n).write_text(n)
+    pattern = str(tmp_path / "*.jpg")
+
+    ts = datetime(2018, 5, 6)
+
+    def fake_gather(file_to_fix, **kw):
+        if Path(file_to_fix).name == "many.jpg":
+            return [("s1", ts), ("s2", datetime(2019, 1, 1))]
+        return [("s", ts)]
+
+    applied = []
+    prompted = []
+
+    def fake_choose(candidates):
+        prompted.append(candidates)
+        return None
+
+    monkeypatch.setattr(date_mapper, "gather_candidates", fake_gather)
+    monkeypatch.setattr(date_mapper, "interactive_choose", fake_choose)
+    monkeypatch.setattr(date_mapper, "apply_destinations", lambda path, *a, **kw: applied.append(Path(path).name))
+
+    set_dates.cmd_set_dates(pattern, dest_tags=["X"], interactive=False, workers=4)
+
+    assert sorted(applied) == ["one.jpg", "two.jpg"]
+    assert len(prompted) == 1
+    assert capsys.readouterr().out.count("APPLIED") == 2
+
+
+def test_cmd_set_dates_workers_report_survives_failure(monkeypatch, tmp_path, capsys):
+    """Files rewritten before a worker fails are still reported."""
+    for n in ("a.jpg", "b.jpg", "zz.jpg"):
+        (tmp_path / n).write_text(n)
+    pattern = str(tmp_path / "*.jpg")
+
+    def fake_apply(path, *a, **kw):
+        if Path(path).name == "zz.jpg":
+            raise RuntimeError("write failed")
+
+    monkeypatch.setattr(date_mapper, "gather_candidates", lambda file_to_fix, **kw: [("s", datetime(2018, 5, 6))])
+    monkeypatch.setattr(date_mapper, "apply_destinations", fake_apply)
+
+    with pytest.raises(RuntimeError):
+        set_dates.cmd_set_dates(pattern, dest_tags=["X"], interactive=False, workers=4)
+
+    out = capsys.readouterr().out
+    assert "a.jpg" in out and "b.jpg" in out
+    assert out.count("APPLIED") == 2
+
+
+def test_cmd_set_dates_report_survives_failure(monkeypatch, tmp_path, capsys):
+    """Files rewritten before a write fails are still reported."""
+    for n in ("a.jpg", "b.jpg", "zz.jpg"):
+        (tmp_path / n).write_text(n)
+    pattern = str(tmp_path / "*.jpg")
+
+    def fake_apply(path, *a, **kw):
+        if Path(path).name == "zz.jpg":
+            raise RuntimeError("write failed")
+
+    monkeypatch.setattr(date_mapper, "gather_candidates", lambda file_to_fix, **kw: [("s", datetime(2018, 5, 6))])
+    monkeypatch.setattr(date_mapper, "apply_destinations", fake_apply)
+
+    with pytest.raises(RuntimeError):
+        set_dates.cmd_set_dates(pattern, dest_tags=["X"], interactive=False)
+
+    out = capsys.readouterr().out
+    assert "a.jpg" in out and "b.jpg" in out
+    assert out.count("APPLIED") == 2
+
+
+def test_cmd_set_dates_workers_report_files_finished_after_failure(monkeypatch, tmp_path, capsys):
+    """A failure does not hide files other workers go on to rewrite,
+    and files not started yet are not touched."""
+    import threading
+
+    for n in ("a.jpg", "b.jpg", "c.jpg", "d.jpg"):
+        (tmp_path / n).write_text(n)
+    pattern = str(tmp_path / "*.jpg")
+    lock = threading.Lock()
+    second_running = threading.Event()
+    calls = []
+    applied = []
+
+    def fake_apply(path, *a, **kw):
+        with lock:
+            calls.append(path)
+            first = len(calls) == 1
+        if first:
+            # fail while the other worker is still writing its file
+            second_running.wait(5)
+            raise RuntimeError("write failed")
+        second_running.set()
+        time.sleep(0.1)
+        applied.append(Path(path).name)
+
+    monkeypatch.setattr(date_mapper, "gather_candidates", lambda file_to_fix, **kw: [("s", datetime(2018, 5, 6))])
+    monkeypatch.setattr(date_mapper, "apply_destinations", fake_apply)
+
+    with pytest.raises(RuntimeError):
+        set_dates.cmd_set_dates(pattern, dest_tags=["X"], interactive=False, workers=2)
+
+    reported = [
+        Path(line.split()[1]).name
+        for line in capsys.readouterr().out.splitlines()
+        if line.startswith("APPLIED")
+    ]
+    # every rewritten file is reported, and nothing else is
+    assert applied and sorted(reported) == sorted(applied)
+    # the failed file's worker may already have taken one more file;
+    # the last one is never started
+    assert len(calls) <= 3
+
+
+def test_apply_system_times_bulk_groups_setfile_by_date(monkeypatch, tmp_path):
+    """Files sharing a creation date are passed to a single SetFile run."""
+    files = []
+    for name in ("a.jpg", "b.jpg", "c.jpg"):
+        f = tmp_path / name
+        f.write_text("x")
+        files.append(f)
+    same = datetime(2020, 1, 2, 3, 4, 5)
+    other = datetime(2021, 1, 2, 3, 4, 5)
+
+    monkeypatch.setattr(shutil, "which", lambda name: "/foo/bar/SetFile")
+    calls = []
+    monkeypatch.setattr(subprocess, "run", lambda args, check=False: calls.append(args))
+
+    tag = "File:System:FileCreateDate"
+    set_dates.apply_system_times_bulk([(files[0], tag, same), (files[1], tag, other), (files[2], tag, same)])
+    assert sorted(len(c) for c in calls) == [4, 5]
+    grouped = next(c for c in calls if len(c) == 5)
+    assert grouped[3:] == [str(files[0]), str(files[2])]
+
+    # modification times are still applied directly
+    set_dates.apply_system_times_bulk([(files[0], "File:System:FileModifyDate", same)])
+    assert int(files[0].stat().st_mtime) == int(same.timestamp())
+
+
+def test_apply_system_time_accepts_timestamps(tmp_path):
+    """A POSIX timestamp is applied as is, without a datetime round trip."""
+    f = tmp_path / "t.txt"
+    f.write_text("x")
+    set_dates.apply_system_time(f, "File:System:FileModifyDate", 1577934245.5)
+    assert f.stat().st_mtime == 1577934245.5
+
+
+def test_batched_setfile_looks_up_setfile_once(monkeypatch, tmp_path):
+    """Queued creation times search PATH for SetFile once per batch."""
+    files = []
+    for name in ("a.jpg", "b.jpg", "c.jpg"):
+        f = tmp_path / name
+        f.write_text("x")
+        files.append(f)
+
+    lookups = []
+    monkeypatch.setattr(shutil, "which", lambda name: lookups.append(name) or "/foo/bar/SetFile")
+    calls = []
+    monkeypatch.setattr(subprocess, "run", lambda args, check=False: calls.append(args))
+
+    dt = datetime(2020, 1, 2, 3, 4, 5)
+    with set_dates.batched_setfile():
+        for f in files:
+            set_dates.apply_system_time(f, "File:System:FileCreateDate", dt)
+    assert lookups == ["SetFile"]
+    assert len(calls) == 1 and calls[0][3:] == [str(f) for f in files]
+
+
+def test_apply_system_times_bulk_last_creation_time_wins(monkeypatch, tmp_path):
+    """A file queued twice gets the creation time it was given last."""
+    a, b = tmp_path / "a.jpg", tmp_path / "b.jpg"
+    first, second = datetime(2020, 1, 2, 3, 4, 5), datetime(2021, 1, 2, 3, 4, 5)
+
+    monkeypatch.setattr(shutil, "which", lambda name: "/foo/bar/SetFile")
+    calls = []
+    monkeypatch.setattr(subprocess, "run", lambda args, check=False: calls.append(args))
+
+    tag = "File:System:FileCreateDate"
+    set_dates.apply_system_times_bulk([(a, tag, first), (b, tag, second), (a, tag, second)])
+    assert calls == [["SetFile", "-d", set_dates._setfile_date(second), str(b), str(a)]]
+
+
+def test_apply_system_time_keeps_microseconds_exact(tmp_path):
+    f = tmp_path / "u.txt"
+    f.write_text("x")
+    dt = datetime(2020, 1, 2, 3, 4, 5, 123457)
+    set_dates.apply_system_time(f, "File:System:FileModifyDate", dt)
+    st = f.stat()
+    assert st.st_mtime_ns == int(dt.replace(microsecond=0).timestamp()) * 10**9 + 123457000
+    assert datetime.fromtimestamp(st.st_mtime) == dt
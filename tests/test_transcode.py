@@ -1,6 +1,8 @@
 from pathlib import Path
 import pytest
+import os
 import shutil
+import subprocess
 from datefixer import (
     transcode as transcode_mod
 )
@@ -23,8 +25,25 @@ def copy_fixture_to(path, name):
     return dest
 
 
+def link_fixture_to(path, name):
+    """Like :func:`copy_fixture_to`, for tests that never write the file.
+
+    The fixture is hard linked rather than copied where the filesystem
+    allows it.
+    """
+    src = FIXDIR / name
+    assert src.exists()
+    dest = path / src.name
+    try:
+        os.link(src, dest)
+    except OSError:
+        # another filesystem, or links not permitted
+        shutil.copy2(src, dest)
+    return dest
+
+
 def test_video_transcode_dry_run(tmp_path):
-    temp_file = copy_fixture_to(tmp_path, "Samsung phone 2 2014 010.mp4")
+    temp_file = link_fixture_to(tmp_path, "Samsung phone 2 2014 010.mp4")
     assert temp_file.exists() and temp_file.is_file()
 
     output_file = Path(temp_file.parent / f"{temp_file.stem}.reduced.mp4")
@@ -43,7 +62,7 @@ def test_video_transcode_dry_run(tmp_path):
 
 
 def test_video_transcode(tmp_path):
-    temp_file = copy_fixture_to(tmp_path, "Samsung phone 2 2014 010.mp4")
+    temp_file = link_fixture_to(tmp_path, "Samsung phone 2 2014 010.mp4")
     assert temp_file.exists() and temp_file.is_file()
 
     output_file = Path(temp_file.parent / f"{temp_file.stem}.reduced.mp4")
@@ -64,7 +83,7 @@ def test_video_transcode(tmp_path):
 
 
 def test_video_transcode_with_move(tmp_path):
-    temp_file = copy_fixture_to(tmp_path, "Samsung phone 2 2014 010.mp4")
+    temp_file = link_fixture_to(tmp_path, "Samsung phone 2 2014 010.mp4")
     assert temp_file.exists() and temp_file.is_file()
 
     output_file = Path(temp_file.parent / f"{temp_file.stem}.reduced.mp4")
@@ -85,3 +104,59 @@ def test_video_transcode_with_move(tmp_path):
     assert moved_temp_file.exists() and output_file.is_file()
     # output file should be smaller than input
     assert output_file.stat().st_size < moved_temp_file.stat().st_size
+
+
+def test_pick_hevc_encoder_prefers_hardware(monkeypatch):
+    monkeypatch.setattr(transcode_mod, "available_encoders", lambda: frozenset({"libx265", "hevc_qsv", "hevc_nvenc"}))
+    assert transcode_mod.pick_hevc_encoder() == "hevc_nvenc"
+    monkeypatch.setattr(transcode_mod, "available_encoders", lambda: frozenset({"libx264"}))
+    assert transcode_mod.pick_hevc_encoder() == "libx265"
+    assert transcode_mod._video_args("libx265", 28)[:2] == ["-c:v", "libx265"]
+    assert "-cq" in transcode_mod._video_args("hevc_nvenc", 28)
+
+
+def test_transcode_dry_run_threads(monkeypatch, capsys, tmp_path):
+    monkeypatch.setattr(transcode_mod, "has_ffmpeg", lambda: True)
+    src = tmp_path / "in.mp4"
+    assert transcode_mod.transcode_video(src, tmp_path / "out.mp4", dry_run=True, threads=2)
+    cmd = capsys.readouterr().out.split()
+    assert cmd[cmd.index("-threads") + 1] == "2"
+    # workers share the terminal; ffmpeg must not read keys from it
+    assert "-nostdin" in cmd
+    assert cmd[-1] == str(tmp_path / "out.mp4")
+
+
+def test_transcode_hardware_encoder_decodes_on_gpu(monkeypatch, capsys, tmp_path):
+    monkeypatch.setattr(transcode_mod, "has_ffmpeg", lambda: True)
+    src = tmp_path / "in.mp4"
+    transcode_mod.transcode_video(src, tmp_path / "out.mp4", dry_run=True, encoder="hevc_nvenc")
+    cmd = capsys.readouterr().out.split()
+    # the decoder option has to come before the input
+    assert cmd.index("-hwaccel") < cmd.index("-i")
+    assert cmd[cmd.index("-hwaccel") + 1] == "cuda"
+
+    transcode_mod.transcode_video(src, tmp_path / "out.mp4", dry_run=True)
+    assert "-hwaccel" not in capsys.readouterr().out
+
+
+def test_transcode_hardware_failure_keeps_existing_output(monkeypatch, tmp_path):
+    monkeypatch.setattr(transcode_mod, "has_ffmpeg", lambda: True)
+    runs = []
+
+    def fake_run(cmd, check=False):
+        runs.append(cmd)
+        raise subprocess.CalledProcessError(1, cmd)
+
+    monkeypatch.setattr(transcode_mod.subprocess, "run", fake_run)
+    src = tmp_path / "in.mp4"
+    dst = tmp_path / "out.mp4"
+    # a new output is retried with libx265, which may replace the leftover
+    assert not transcode_mod.transcode_video(src, dst, encoder="hevc_nvenc")
+    assert len(runs) == 2 and "-y" in runs[1]
+
+    # an output that was already there is never overwritten
+    runs.clear()
+    dst.write_text("keep")
+    assert not transcode_mod.transcode_video(src, dst, encoder="hevc_nvenc")
+    assert len(runs) == 1 and "-y" not in runs[0]
+    assert dst.read_text() == "keep"
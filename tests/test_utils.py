@@ -24,19 +24,55 @@ def test_parse_invalid_dates(s):
     assert utils.parse_date(s) is None
 
 
-def test_parse_examples():
-    examples = [
-        ("2025:11:15 03:46:40", 2025),
-        ("2025-11-15 03:46:40", 2025),
-        ("2025-11-15T03:46:40Z", 2025),
-        ("2025-11-15T03:46:40.732+13:00", 2025),
-        ("2025:11:15 03:46:40.732+13:00", 2025),
-        ("2025-11-14 14:29:19Z", 2025),
-        ("2023:03:09 10:57:00", 2023),
-    ]
-    for s, yr in examples:
-        dt = utils.parse_date(s)
-        assert dt is not None and dt.year == yr
+@pytest.mark.parametrize("s,yr", [
+    ("2025:11:15 03:46:40", 2025),
+    ("2025-11-15 03:46:40", 2025),
+    ("2025-11-15T03:46:40Z", 2025),
+    ("2025-11-15T03:46:40.732+13:00", 2025),
+    ("2025:11:15 03:46:40.732+13:00", 2025),
+    ("2025-11-14 14:29:19Z", 2025),
+    ("2023:03:09 10:57:00", 2023),
+])
+def test_parse_examples(s, yr):
+    dt = utils.parse_date(s)
+    assert dt is not None and dt.year == yr
+
+
+def test_parse_date_fast_paths_and_non_strings():
+    assert utils.parse_date("2020:01:02 03:04:05") == datetime(2020, 1, 2, 3, 4, 5)
+    dt = utils.parse_date("2020-01-02T03:04:05.250+02:00")
+    assert dt.microsecond == 250000 and dt.utcoffset().total_seconds() == 7200
+    # exiftool can return lists and numbers; they are not dates
+    assert utils.parse_date(["2020:01:02 03:04:05"]) is None
+    assert utils.parse_date(1234) is None
+
+
+@pytest.mark.parametrize("s", [
+    "2020-01-0260304",
+    "2020-01-02Z0304",
+    "2020-01-02+03+04:55",
+    "2020-01-02T03:04:05,5",
+])
+def test_parse_date_iso_fast_path_rejects_loose_shapes(s):
+    # fromisoformat accepts these on newer Pythons; the parser never did
+    assert utils.parse_date(s) is None
+
+
+def test_parse_date_exif_subseconds_and_offsets():
+    dt = utils.parse_date("2020:01:02 03:04:05.5+01:30")
+    assert dt.microsecond == 500000 and dt.utcoffset().total_seconds() == 5400
+    dt = utils.parse_date("2020:01:02 03:04:05Z")
+    assert dt.utcoffset().total_seconds() == 0
+    assert utils.parse_date("2020:01:02 03:04:05.12-0500").utcoffset().total_seconds() == -18000
+
+
+def test_parse_date_explicit_format_shapes():
+    # strings that skip the fast paths and go to the format table
+    dt = utils.parse_date("2020:01:02  03:04:05.5+01:30")
+    assert dt.microsecond == 500000 and dt.utcoffset().total_seconds() == 5400
+    assert utils.parse_date("2020:01:02") == datetime(2020, 1, 2)
+    # strptime's %d takes a leading blank, so a space alone is not a time part
+    assert utils.parse_date("2020:01: 2") == datetime(2020, 1, 2)
 
 
 def test_parse_exif_like_formats():
@@ -65,18 +101,17 @@ def test_infer_from_filename():
     assert dt is not None
 
 
-def test_filename_inference_examples():
-    cases = [
-        ("IMG_20230115_142300.jpg", 2023),
-        ("PXL_20240201_073211.mp4", 2024),
-        ("2020-04-19 11.13.54.jpg", 2020),
-        ("20220305_183412.heic", 2022),
-        ("20230101-123045.jpg", 2023),
-        ("2023_01_02.jpg", 2023),
-    ]
-    for name, yr in cases:
-        dt = utils.infer_from_filename(name)
-        assert dt is not None and dt.year == yr
+@pytest.mark.parametrize("name,yr", [
+    ("IMG_20230115_142300.jpg", 2023),
+    ("PXL_20240201_073211.mp4", 2024),
+    ("2020-04-19 11.13.54.jpg", 2020),
+    ("20220305_183412.heic", 2022),
+    ("20230101-123045.jpg", 2023),
+    ("2023_01_02.jpg", 2023),
+])
+def test_filename_inference_examples(name, yr):
+    dt = utils.infer_from_filename(name)
+    assert dt is not None and dt.year == yr
 
 
 def test_infer_from_filename_varieties():
@@ -95,3 +130,98 @@ def test_infer_from_filename_varieties():
         assert dt.year == y
         assert dt.month == m
         assert dt.day == d
+
+
+def test_iter_files_matches_glob(tmp_path, monkeypatch):
+    """`iter_files` returns the same files as `glob.glob(recursive=True)`.
+
+    Covers relative and absolute patterns, `**` recursion, hidden names
+    and directories that match the pattern but must be skipped.
+    """
+    import glob
+    import os
+
+    (tmp_path / "a.jpg").write_text("a")
+    (tmp_path / ".hidden.jpg").write_text("h")
+    (tmp_path / "dir.jpg").mkdir()
+    (tmp_path / "sub" / "deeper").mkdir(parents=True)
+    (tmp_path / "sub" / "b.jpg").write_text("b")
+    (tmp_path / "sub" / "deeper" / "c.JPG").write_text("c")
+    (tmp_path / "sub" / "deeper" / "d.txt").write_text("d")
+    monkeypatch.chdir(tmp_path)
+
+    def files_from_glob(pattern):
+        return sorted(p for p in glob.glob(pattern, recursive=True) if os.path.isfile(p))
+
+    for pattern in ["*.jpg", "**/*.jpg", "**/*", "sub/*/*", "sub/b.jpg", "*/*.[jJ][pP][gG]",
+                    str(tmp_path / "**" / "*.jpg"), "nomatch/*.jpg"]:
+        assert sorted(utils.iter_files(pattern)) == files_from_glob(pattern), pattern
+
+
+def test_walk_files_lists_whole_tree(tmp_path):
+    """`walk_files` finds the same files as `Path.rglob`, in any order."""
+    for rel in ["a.mp4", "x/b.mp4", "x/y/c.mov", "x/y/z/d.txt", ".hidden/e.mp4", "x/.f.mp4"]:
+        f = tmp_path / rel
+        f.parent.mkdir(parents=True, exist_ok=True)
+        f.write_text("v")
+    (tmp_path / "empty").mkdir()
+
+    walked = sorted(p for p, _entry in utils.walk_files(str(tmp_path), workers=3))
+    assert walked == sorted(str(p) for p in tmp_path.rglob("*") if p.is_file())
+    # hidden files and directories are included, as rglob does
+    assert len(walked) == 6
+
+    pruned = sorted(p for p, _entry in utils.walk_files(str(tmp_path), skip_dirs={"y"}))
+    assert pruned == sorted(str(tmp_path / rel) for rel in ["a.mp4", "x/b.mp4", ".hidden/e.mp4", "x/.f.mp4"])
+
+    # stopping early must not hang
+    it = utils.walk_files(str(tmp_path), workers=2)
+    next(it)
+    it.close()
+
+
+def test_split_csv():
+    assert utils.split_csv(None) == []
+    assert utils.split_csv("") == []
+    assert utils.split_csv(" A , B,,C ") == ["A", "B", "C"]
+
+
+def test_move_file_renames_and_falls_back_across_devices(tmp_path, monkeypatch):
+    import errno
+    import os
+
+    src = tmp_path / "a.jpg"
+    src.write_text("a")
+    utils.move_file(src, tmp_path / "b.jpg")
+    assert not src.exists() and (tmp_path / "b.jpg").read_text() == "a"
+
+    def cross_device(_src, _dst):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(os, "replace", cross_device)
+    utils.move_file(tmp_path / "b.jpg", tmp_path / "c.jpg")
+    assert (tmp_path / "c.jpg").read_text() == "a"
+
+    with pytest.raises(FileNotFoundError):
+        monkeypatch.undo()
+        utils.move_file(tmp_path / "missing.jpg", tmp_path / "d.jpg")
+
+
+def test_expand_pattern_accepts_globs_and_expanded_lists(tmp_path):
+    (tmp_path / "a.jpg").write_text("x")
+    (tmp_path / "b.txt").write_text("x")
+    found = utils.expand_pattern(str(tmp_path / "*.jpg"))
+    assert found == [str(tmp_path / "a.jpg")]
+    assert utils.expand_pattern(tmp_path / "*.jpg") == found
+    # already expanded paths are used as given, without walking again
+    assert utils.expand_pattern([tmp_path / "b.txt", "c.jpg"]) == [str(tmp_path / "b.txt"), "c.jpg"]
+
+
+def test_birthtime_prefers_stat_then_statx(tmp_path):
+    from types import SimpleNamespace
+    f = tmp_path / "a.jpg"
+    f.write_text("x")
+    assert utils.birthtime(f, SimpleNamespace(st_birthtime=123.5)) == 123.5
+    ts = utils.birthtime(f)
+    # None where neither stat nor statx knows the creation time
+    assert ts is None or abs(ts - f.stat().st_mtime) < 60